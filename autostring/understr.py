@@ -1,8 +1,50 @@
+import mmap
+import os
 import tkinter as tk
+from collections import deque
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from multiprocessing import shared_memory
+
+PARALLEL_MIN_SIZE = 1 << 20
+AUTOMATON_CACHE_SIZE = 128
+MAX_REGEX_STATES = 10000
+MAX_REGEX_CELLS = 1 << 20
+
+
+def _fold_char(char):
+    # Case-insensitive matching compares single-character lower-case forms
+    lower = char.lower()
+    return lower if len(lower) == 1 else char
+
+
+def _fold(text):
+    return "".join(map(_fold_char, text))
+
+
+class _FoldMap(dict):
+    """
+    Character -> column for literal patterns. The keys are folded pattern characters;
+    any other character is folded with _fold_char on first sight and memoised.
+    """
+
+    def __missing__(self, char):
+        column = self.get(_fold_char(char), 0)
+        self[char] = column
+        return column
 
 
 def build_automaton(pattern):
-    pattern = pattern.lower()
+    # The cached automaton is shared by every caller, so hand out a copy
+    automaton, alphabet = _build_automaton(pattern)
+    return [dict(transitions) for transitions in automaton], set(alphabet)
+
+
+@lru_cache(maxsize=AUTOMATON_CACHE_SIZE)
+def _build_automaton(pattern):
+    pattern = _fold(pattern)
     m = len(pattern)
     if m == 0:
         return [{}], set()
@@ -31,32 +73,645 @@ def build_automaton(pattern):
     return automaton, alphabet
 
 
+@lru_cache(maxsize=AUTOMATON_CACHE_SIZE)
+def compile_automaton(pattern):
+    automaton, alphabet = _build_automaton(pattern)
+    alphabet = sorted(alphabet)
+    width = len(alphabet) + 1
+
+    classes = _FoldMap((char, column) for column, char in enumerate(alphabet, start=1))
+
+    table = [0] * (len(automaton) * width)
+    for state, transitions in enumerate(automaton):
+        for char, target in transitions.items():
+            table[state * width + classes[char]] = target
+
+    return table, classes, width
+
+
+@lru_cache(maxsize=AUTOMATON_CACHE_SIZE)
+def compile_byte_automaton(pattern, encoding="utf-8"):
+    # Каждый символ образца — набор байтовых форм всех символов, которые _fold_char
+    # сводит к нему. В многобайтовых кодировках регистр не сводится к замене отдельных
+    # байтов, поэтому автомат строится по всем формам сразу
+    variants = []
+    for char in _fold(pattern):
+        forms = {char.encode(encoding)}
+        for variant in _case_variants().get(char, ()):
+            try:
+                forms.add(variant.encode(encoding))
+            except UnicodeError:
+                pass
+        variants.append(forms)
+    final = len(variants)
+    alphabet = sorted({byte for forms in variants for form in forms for byte in form})
+    width = len(alphabet) + 1
+
+    def advance(subset, byte):
+        # Состояние НКА: (номер символа, байтов до него, прочитанная часть его формы)
+        targets = {start}
+        for char, length, part in subset:
+            if char == final:
+                continue
+            part += bytes([byte])
+            for form in variants[char]:
+                if form == part:
+                    targets.add((char + 1, length + len(form), b""))
+                elif form.startswith(part):
+                    targets.add((char, length, part))
+        return frozenset(targets)
+
+    start = (0, 0, b"")
+    index = {frozenset([start]): 0}
+    subsets = list(index)
+    table = []
+    for subset in subsets:
+        table.append(0)
+        for byte in alphabet:
+            targets = advance(subset, byte)
+            if targets not in index:
+                if len(subsets) >= MAX_REGEX_STATES:
+                    raise ValueError(f"Pattern needs more than {MAX_REGEX_STATES} DFA states")
+                index[targets] = len(subsets)
+                subsets.append(targets)
+            table.append(index[targets])
+
+    # Длины совпадений, заканчивающихся в состоянии, по убыванию: начала идут по возрастанию
+    matches = [sorted((length for char, length, _ in subset if char == final), reverse=True)
+               for subset in subsets]
+    classes = bytearray(256)
+    for column, byte in enumerate(alphabet, start=1):
+        classes[byte] = column
+    # Байты, уводящие автомат из состояния 0: на них останавливается поиск через find
+    starts = bytes(int(table[classes[byte]] != 0) for byte in range(256))
+    longest = sum(max(len(form) for form in forms) for forms in variants)
+    return table, bytes(classes), width, matches, starts, longest
+
+
+def search_stream_with_automaton(chunks, pattern, encoding="utf-8"):
+    chunks = iter(chunks)
+    head = next(chunks, None)
+    if not pattern or head is None:
+        return
+    chunks = chain([head], chunks)
+    state = 0
+    offset = 0
+
+    if isinstance(head, str):
+        table, classes, width = compile_automaton(pattern)
+        final = len(_fold(pattern))
+        for chunk in chunks:
+            for i, char in enumerate(chunk, start=offset):
+                state = table[state * width + classes[char]]
+                if state == final:
+                    yield i - final + 1
+            offset += len(chunk)
+        return
+
+    table, classes, width, matches, starts, _ = compile_byte_automaton(pattern, encoding)
+    for chunk in chunks:
+        chunk = bytes(chunk)
+        data = chunk.translate(classes)
+        marks = chunk.translate(starts)
+        i = 0
+        while i < len(data):
+            if state == 0:
+                i = marks.find(1, i)
+                if i < 0:
+                    break
+            state = table[state * width + data[i]]
+            if matches[state]:
+                for length in matches[state]:
+                    yield offset + i - length + 1
+            i += 1
+        offset += len(data)
+
+
+def read_chunks(source, chunk_size=1 << 20):
+    read = getattr(source, "recv", None) or source.read
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def search_file_with_automaton(path, pattern, encoding="utf-8", chunk_size=1 << 20):
+    with open(path, "rb") as file:
+        yield from search_stream_with_automaton(read_chunks(file, chunk_size), pattern, encoding)
+
+
 def search_with_automaton(text, pattern):
-    text = text.lower()
-    pattern = pattern.lower()
-    if not pattern:
+    return list(search_stream_with_automaton([text], pattern))
+
+
+def search_bytes_with_automaton(data, pattern, encoding="utf-8"):
+    return list(search_stream_with_automaton([data], pattern, encoding))
+
+
+def split_spans(size, pattern_length, workers, chunk_size=None):
+    chunk_size = max(chunk_size or -(-size // (workers * 4)), pattern_length, 1)
+    return [(start, min(start + chunk_size + pattern_length - 1, size)) for start in range(0, size, chunk_size)]
+
+
+def _search_file_span(path, start, end, pattern, encoding):
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return [start + position for position in search_bytes_with_automaton(data[start:end], pattern, encoding)]
+
+
+def _search_shared_span(name, start, end, pattern, encoding):
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        chunk = bytes(memory.buf[start:end])
+    finally:
+        memory.close()
+    return [start + position for position in search_bytes_with_automaton(chunk, pattern, encoding)]
+
+
+def _search_spans(worker, source, size, pattern, encoding, workers, chunk_size):
+    spans = split_spans(size, compile_byte_automaton(pattern, encoding)[5], workers, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(worker, source, start, end, pattern, encoding) for start, end in spans]
+        return sorted(set(chain.from_iterable(future.result() for future in futures)))
+
+
+def parallel_search_file(path, pattern, encoding="utf-8", workers=None, chunk_size=None):
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+    if not pattern or size == 0:
         return []
+    if workers == 1 or size < PARALLEL_MIN_SIZE:
+        return list(search_file_with_automaton(path, pattern, encoding))
+    return _search_spans(_search_file_span, path, size, pattern, encoding, workers, chunk_size)
+
 
-    automaton, _ = build_automaton(pattern)
+def parallel_search_bytes(data, pattern, encoding="utf-8", workers=None, chunk_size=None):
+    workers = workers or os.cpu_count() or 1
+    if not pattern or not data:
+        return []
+    if workers == 1 or len(data) < PARALLEL_MIN_SIZE:
+        return search_bytes_with_automaton(data, pattern, encoding)
+
+    memory = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        memory.buf[:len(data)] = data
+        return _search_spans(_search_shared_span, memory.name, len(data), pattern, encoding, workers, chunk_size)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+@lru_cache(maxsize=AUTOMATON_CACHE_SIZE)
+def build_aho_corasick(patterns):
+    patterns = [_fold(pattern) for pattern in patterns]
+    alphabet = sorted(set("".join(patterns)))
+    classes = _FoldMap((char, column) for column, char in enumerate(alphabet, start=1))
+    width = len(alphabet) + 1
+
+    goto = [{}]
+    outputs = [[]]
+    for pattern_id, pattern in enumerate(patterns):
+        if not pattern:
+            continue
+        state = 0
+        for char in pattern:
+            column = classes[char]
+            if column not in goto[state]:
+                goto[state][column] = len(goto)
+                goto.append({})
+                outputs.append([])
+            state = goto[state][column]
+        outputs[state].append(pattern_id)
+
+    table = [0] * (len(goto) * width)
+    fail = [0] * len(goto)
+    queue = deque()
+    for column, child in goto[0].items():
+        table[column] = child
+        queue.append(child)
+
+    while queue:
+        state = queue.popleft()
+        outputs[state].extend(outputs[fail[state]])
+        for column in range(1, width):
+            child = goto[state].get(column)
+            fallback = table[fail[state] * width + column]
+            if child is None:
+                table[state * width + column] = fallback
+            else:
+                table[state * width + column] = child
+                fail[child] = fallback
+                queue.append(child)
+
+    return table, classes, width, outputs, [len(pattern) for pattern in patterns]
+
+
+def search_many_with_automaton(text, patterns):
+    table, classes, width, outputs, lengths = build_aho_corasick(tuple(patterns))
     state = 0
     matches = []
 
     for i, char in enumerate(text):
-        state = automaton[state].get(char, 0)
-        if state == len(pattern):
-            matches.append(i - len(pattern) + 1)
+        state = table[state * width + classes[char]]
+        for pattern_id in outputs[state]:
+            matches.append((pattern_id, i - lengths[pattern_id] + 1))
+
+    return matches
+
+
+@lru_cache(maxsize=None)
+def _cased_code_points():
+    return [code for code in range(0x110000) if _fold_char(chr(code)) != chr(code)]
+
+
+@lru_cache(maxsize=None)
+def _case_variants():
+    # Folded character -> characters that fold to it
+    variants = {}
+    for code in _cased_code_points():
+        variants.setdefault(_fold_char(chr(code)), []).append(chr(code))
+    return variants
+
+
+def _merge_ranges(ranges):
+    merged = []
+    for low, high in sorted(ranges):
+        if merged and low <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+        else:
+            merged.append((low, high))
+    return tuple(merged)
+
+
+def _fold_ranges(ranges):
+    # Half-open code point ranges mapped through _fold_char: input characters are folded
+    # before lookup, so characters that fold to something else are replaced by their folds
+    folded = []
+    for low, high in _merge_ranges(ranges):
+        if high - low <= 4096:
+            codes = [code for code in range(low, high) if _fold_char(chr(code)) != chr(code)]
+        else:
+            cased = _cased_code_points()
+            codes = cased[bisect_left(cased, low):bisect_left(cased, high)]
+        for code in codes:
+            if low < code:
+                folded.append((low, code))
+            target = ord(_fold_char(chr(code)))
+            folded.append((target, target + 1))
+            low = code + 1
+        if low < high:
+            folded.append((low, high))
+    return _merge_ranges(folded)
+
+
+def _parse_regex(pattern):
+    position = 0
+
+    def peek():
+        return pattern[position] if position < len(pattern) else None
+
+    def take():
+        nonlocal position
+        char = pattern[position]
+        position += 1
+        return char
+
+    def parse_alternation():
+        node = parse_concatenation()
+        while peek() == "|":
+            take()
+            node = ("alt", node, parse_concatenation())
+        return node
+
+    def parse_concatenation():
+        node = ("empty",)
+        while peek() is not None and peek() not in "|)":
+            node = ("cat", node, parse_repetition())
+        return node
+
+    def parse_repetition():
+        node = parse_atom()
+        while peek() is not None and peek() in "*+?":
+            operator = take()
+            if operator == "*":
+                node = ("star", node)
+            elif operator == "+":
+                node = ("cat", node, ("star", node))
+            else:
+                node = ("alt", node, ("empty",))
+        return node
+
+    def parse_atom():
+        char = take()
+        if char == "(":
+            node = parse_alternation()
+            if peek() != ")":
+                raise ValueError(f"Missing ')' at position {position}")
+            take()
+            return node
+        if char == "[":
+            return parse_class()
+        if char == ".":
+            return ("set", (), True)
+        if char in "*+?":
+            raise ValueError(f"Nothing to repeat at position {position - 1}")
+        if char == "\\":
+            if peek() is None:
+                raise ValueError("Pattern ends with '\\'")
+            char = take()
+        return ("set", _fold_ranges([(ord(char), ord(char) + 1)]), False)
+
+    def parse_class():
+        negated = peek() == "^"
+        if negated:
+            take()
+        ranges = []
+        first = True
+        while peek() != "]" or first:
+            if peek() is None:
+                raise ValueError("Missing ']'")
+            first = False
+            low = take()
+            if low == "\\" and peek() is not None:
+                low = take()
+            high = low
+            if peek() == "-" and position + 1 < len(pattern) and pattern[position + 1] != "]":
+                take()
+                high = take()
+                if high == "\\" and peek() is not None:
+                    high = take()
+                if ord(high) < ord(low):
+                    raise ValueError(f"Bad range {low}-{high}")
+            ranges.append((ord(low), ord(high) + 1))
+        take()
+        return ("set", _fold_ranges(ranges), negated)
+
+    node = parse_alternation()
+    if position != len(pattern):
+        raise ValueError(f"Unexpected ')' at position {position}")
+    return node
+
+
+def _collect_sets(node, sets):
+    if node[0] == "set":
+        sets.add(node[1])
+    for child in node[1:]:
+        if isinstance(child, tuple) and child and isinstance(child[0], str):
+            _collect_sets(child, sets)
+
+
+def _build_alphabet(node):
+    """
+    Splits the code point space into disjoint intervals at every set boundary and
+    gives one column to each group of intervals that belong to the same sets.
+    Returns (width, interval starts, column per interval, {ranges: columns inside}).
+    Column 0 holds every character outside all sets.
+    """
+    sets = set()
+    _collect_sets(node, sets)
+    events = {}
+    for ranges in sets:
+        for low, high in ranges:
+            events.setdefault(low, []).append((ranges, 1))
+            events.setdefault(high, []).append((ranges, -1))
+
+    signatures = {frozenset(): 0}
+    starts = [0]
+    columns = [0]
+    active = {}
+    for boundary in sorted(events):
+        for ranges, delta in events[boundary]:
+            active[ranges] = active.get(ranges, 0) + delta
+            if not active[ranges]:
+                del active[ranges]
+        column = signatures.setdefault(frozenset(active), len(signatures))
+        if column != columns[-1]:
+            starts.append(boundary)
+            columns.append(column)
+
+    members = {ranges: set() for ranges in sets}
+    for signature, column in signatures.items():
+        for ranges in signature:
+            members[ranges].add(column)
+    return len(signatures), starts, columns, members
+
+
+class _ClassMap(dict):
+    """
+    Character -> column. Columns come from a bisect over the interval starts and are
+    memoised, so repeated characters cost one dict lookup.
+    """
+
+    def __init__(self, starts, columns):
+        super().__init__()
+        self.starts = starts
+        self.columns = columns
+
+    def __missing__(self, char):
+        column = self.columns[bisect_right(self.starts, ord(_fold_char(char))) - 1]
+        self[char] = column
+        return column
+
+
+def _build_nfa(node, members, width):
+    epsilon = []
+    moves = []
+
+    def new_state():
+        epsilon.append([])
+        moves.append([])
+        return len(epsilon) - 1
+
+    def build(node):
+        kind = node[0]
+        start = new_state()
+        end = new_state()
+        if kind == "empty":
+            epsilon[start].append(end)
+        elif kind == "set":
+            ranges, negated = node[1], node[2]
+            inside = members.get(ranges, set())
+            if negated:
+                accepted = [column for column in range(width) if column not in inside]
+            else:
+                accepted = sorted(inside)
+            moves[start].append((accepted, end))
+        elif kind == "cat":
+            first_start, first_end = build(node[1])
+            second_start, second_end = build(node[2])
+            epsilon[start].append(first_start)
+            epsilon[first_end].append(second_start)
+            epsilon[second_end].append(end)
+        elif kind == "alt":
+            for child in node[1:]:
+                child_start, child_end = build(child)
+                epsilon[start].append(child_start)
+                epsilon[child_end].append(end)
+        else:
+            child_start, child_end = build(node[1])
+            epsilon[start].extend([child_start, end])
+            epsilon[child_end].extend([child_start, end])
+        return start, end
+
+    start, end = build(node)
+    return epsilon, moves, start, end
+
+
+def _determinize(epsilon, moves, start, end, width):
+    def closure(states):
+        stack = list(states)
+        closed = set(states)
+        while stack:
+            for target in epsilon[stack.pop()]:
+                if target not in closed:
+                    closed.add(target)
+                    stack.append(target)
+        return frozenset(closed)
+
+    initial = closure([start])
+    index = {initial: 0}
+    subsets = [initial]
+    table = []
+    for subset in subsets:
+        buckets = [[] for _ in range(width)]
+        for state in subset:
+            for accepted, target in moves[state]:
+                for column in accepted:
+                    buckets[column].append(target)
+        for column in range(width):
+            targets = closure(buckets[column])
+            if targets not in index:
+                if len(subsets) >= MAX_REGEX_STATES or (len(subsets) + 1) * width > MAX_REGEX_CELLS:
+                    raise ValueError(f"Pattern needs more than {MAX_REGEX_STATES} DFA states "
+                                     f"or {MAX_REGEX_CELLS} table cells")
+                index[targets] = len(subsets)
+                subsets.append(targets)
+            table.append(index[targets])
+
+    accepting = [end in subset for subset in subsets]
+    return table, accepting
+
+
+def _minimize(table, accepting, width):
+    # Hopcroft's algorithm: predecessors per column in CSR form, blocks refined
+    # only where a splitter's predecessors actually fall
+    count = len(accepting)
+    inverse = []
+    for column in range(width):
+        targets = table[column::width]
+        offsets = [0] * (count + 1)
+        for target in targets:
+            offsets[target + 1] += 1
+        for state in range(count):
+            offsets[state + 1] += offsets[state]
+        sources = [0] * count
+        filled = offsets[:-1]
+        for source, target in enumerate(targets):
+            sources[filled[target]] = source
+            filled[target] += 1
+        inverse.append((sources, offsets))
+
+    blocks = [block for block in ({s for s in range(count) if accepting[s]},
+                                  {s for s in range(count) if not accepting[s]}) if block]
+    block_of = [0] * count
+    for number, block in enumerate(blocks):
+        for state in block:
+            block_of[state] = number
+    smallest = min(range(len(blocks)), key=lambda number: len(blocks[number]))
+    work = [(smallest, column) for column in range(width)] if len(blocks) == 2 else []
+    pending = set(work)
+
+    while work:
+        splitter, column = work.pop()
+        pending.discard((splitter, column))
+        sources, offsets = inverse[column]
+        touched = {}
+        for state in blocks[splitter]:
+            for source in sources[offsets[state]:offsets[state + 1]]:
+                touched.setdefault(block_of[source], []).append(source)
+        for number, inside in touched.items():
+            if len(inside) == len(blocks[number]):
+                continue
+            inside = set(inside)
+            blocks[number] -= inside
+            new = len(blocks)
+            blocks.append(inside)
+            for state in inside:
+                block_of[state] = new
+            for other in range(width):
+                if (number, other) in pending:
+                    split = new
+                else:
+                    split = new if len(inside) < len(blocks[number]) else number
+                work.append((split, other))
+                pending.add((split, other))
+
+    # keep the start state at 0, as in the KMP automaton
+    partition = sorted(blocks, key=min)
+    number_of = {}
+    for number, block in enumerate(partition):
+        for state in block:
+            number_of[state] = number
+
+    minimal = [0] * (len(partition) * width)
+    for number, block in enumerate(partition):
+        state = min(block)
+        for column in range(width):
+            minimal[number * width + column] = number_of[table[state * width + column]]
+    return minimal, [accepting[min(block)] for block in partition]
+
+
+@lru_cache(maxsize=AUTOMATON_CACHE_SIZE)
+def compile_regex(pattern, search=False):
+    node = _parse_regex(pattern)
+    if search:
+        node = ("cat", ("star", ("set", (), True)), node)
+
+    width, starts, columns, members = _build_alphabet(node)
+    epsilon, moves, start, end = _build_nfa(node, members, width)
+    table, accepting = _determinize(epsilon, moves, start, end, width)
+    table, accepting = _minimize(table, accepting, width)
+    return table, _ClassMap(starts, columns), width, accepting
+
+
+def match_regex(text, pattern):
+    table, classes, width, accepting = compile_regex(pattern)
+    state = 0
+    for char in text:
+        state = table[state * width + classes[char]]
+    return accepting[state]
+
+
+def search_regex_with_automaton(text, pattern):
+    table, classes, width, accepting = compile_regex(pattern, search=True)
+    state = 0
+    matches = []
+
+    if accepting[state]:
+        matches.append(0)
+    for i, char in enumerate(text, start=1):
+        state = table[state * width + classes[char]]
+        if accepting[state]:
+            matches.append(i)
 
     return matches
 
 
-def index_to_tk_index(index, text):
-    lines = text.split("\n")
-    current_index = index
-    for line_number, line in enumerate(lines, start=1):
-        if current_index < len(line):
-            return f"{line_number}.{current_index}"
-        current_index -= len(line) + 1
-    return f"{len(lines)}.{len(lines[-1])}"
+def line_starts(text):
+    starts = [0]
+    position = text.find("\n")
+    while position >= 0:
+        starts.append(position + 1)
+        position = text.find("\n", position + 1)
+    return starts
+
+
+def index_to_tk_index(index, text, starts=None):
+    if starts is None:
+        starts = line_starts(text)
+    index = min(index, len(text))
+    line_number = bisect_right(starts, index)
+    return f"{line_number}.{index - starts[line_number - 1]}"
 
 
 def display_automaton_and_search():
@@ -89,40 +744,43 @@ def display_automaton_and_search():
     entry_text.tag_remove("highlight", "1.0", tk.END)
 
     if matches:
+        starts = line_starts(text)
+        ranges = []
         for match_start in matches:
             match_end = match_start + len(pattern)
-            start_index = index_to_tk_index(match_start, text)
-            end_index = index_to_tk_index(match_end, text)
-            entry_text.tag_add("highlight", start_index, end_index)
+            ranges.append(index_to_tk_index(match_start, text, starts))
+            ranges.append(index_to_tk_index(match_end, text, starts))
+        entry_text.tag_add("highlight", *ranges)
         entry_text.tag_config("highlight", background="yellow", foreground="black")
 
 
-root = tk.Tk()
-root.title("DFA for Substring Search")
-root.geometry("500x700")
-root.resizable(False, False)
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("DFA for Substring Search")
+    root.geometry("500x700")
+    root.resizable(False, False)
 
-frame_text = tk.Frame(root)
-frame_text.pack(pady=10)
+    frame_text = tk.Frame(root)
+    frame_text.pack(pady=10)
 
-tk.Label(frame_text, text="Enter the text:").pack(anchor="w", padx=5)
-entry_text = tk.Text(frame_text, height=10, width=60)
-entry_text.pack(padx=5, pady=5)
+    tk.Label(frame_text, text="Enter the text:").pack(anchor="w", padx=5)
+    entry_text = tk.Text(frame_text, height=10, width=60)
+    entry_text.pack(padx=5, pady=5)
 
-frame_pattern = tk.Frame(root)
-frame_pattern.pack(pady=10)
+    frame_pattern = tk.Frame(root)
+    frame_pattern.pack(pady=10)
 
-tk.Label(frame_pattern, text="Enter the pattern:").pack(anchor="w", padx=5)
-entry_pattern = tk.Entry(frame_pattern, width=40)
-entry_pattern.pack(padx=5, pady=5)
+    tk.Label(frame_pattern, text="Enter the pattern:").pack(anchor="w", padx=5)
+    entry_pattern = tk.Entry(frame_pattern, width=40)
+    entry_pattern.pack(padx=5, pady=5)
 
-button_build = tk.Button(root, text="Build DFA and Search", command=display_automaton_and_search)
-button_build.pack(pady=10)
+    button_build = tk.Button(root, text="Build DFA and Search", command=display_automaton_and_search)
+    button_build.pack(pady=10)
 
-frame_table = tk.Frame(root)
-frame_table.pack(pady=10)
+    frame_table = tk.Frame(root)
+    frame_table.pack(pady=10)
 
-results_label = tk.Label(root, text="Search results will be displayed here.", wraplength=480, justify="left")
-results_label.pack(pady=10)
+    results_label = tk.Label(root, text="Search results will be displayed here.", wraplength=480, justify="left")
+    results_label.pack(pady=10)
 
-root.mainloop()
+    root.mainloop()
@@ -1,14 +1,28 @@
 import tkinter as tk
+from itertools import islice
 
 # Размер сетки и клетки
 GRID_SIZE = 50
 CELL_SIZE = 8
 
-# Начальное состояние автомата
-grid = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-turmite_position = [GRID_SIZE // 2, GRID_SIZE // 2]
-turmite_state = 'A'
-turmite_direction = 0
+# Упаковка координат в одно целое: key = x * COORD_BASE + y, |y| < COORD_BASE / 2.
+# Хеш int в CPython берётся по модулю 2^61 - 1; COORD_BASE сравнимо с 2^32 по этому
+# модулю, поэтому хеши соседних клеток не совпадают, а |y| может доходить до 2^60
+COORD_BASE = (1 << 61) + (1 << 32) - 1
+
+# Смещения ключа при движении вверх, вправо, вниз, влево
+DELTAS = (-1, COORD_BASE, 1, -COORD_BASE)
+
+# Ускоренный прогон (macro=True): длина записываемого отрезка, наибольший искомый
+# период и наибольший блок обычных шагов между попытками найти цикл
+PROBE_STEPS = 4096
+MAX_PERIOD = 1024
+MAX_BLOCK = 1 << 20
+
+# Сколько клеток поля можно прочитать при проверке одного кандидата в период и
+# сколько клеток повторов записывается прямо в словарь вместо сжатого шоссе
+CHECK_CELLS = 4 * PROBE_STEPS
+MAX_FOLDED_CELLS = 1 << 20
 
 # Правила переходов
 RULES = {
@@ -29,79 +43,550 @@ COLOR_MAP = {
     14: "orange", 15: "white"
 }
 
-# Функции для управления автоматом
-def apply_rules(state, cell):
-    return RULES.get((state, cell), (cell, 0, state))
 
-def move_turmite():
-    global turmite_position, turmite_direction, turmite_state
+def pack(x, y):
+    return x * COORD_BASE + y
+
+
+def unpack(key):
+    x = (key + COORD_BASE // 2) // COORD_BASE
+    return x, key - x * COORD_BASE
+
+
+def apply_rules(state, cell, rules=RULES):
+    return rules.get((state, cell), (cell, 0, state))
+
+
+class Turmite:
+    def __init__(self, x=0, y=0, state='A', direction=0):
+        self.x = x
+        self.y = y
+        self.state = state
+        self.direction = direction  # 0 — вверх, 1 — вправо, 2 — вниз, 3 — влево
+
+    def __repr__(self):
+        return f"Turmite(x={self.x}, y={self.y}, state={self.state!r}, direction={self.direction})"
+
+
+class Highway:
+    """
+    Сжатая периодическая область («шоссе»): отрезок пути тьюрмита, повторённый
+    count раз со сдвигом (dx, dy) на каждом повторе.
+    origin: Упакованные координаты начала первого повтора.
+    writes: Итоговые цвета одного повтора {(x, y) относительно его начала: цвет}.
+    """
+
+    def __init__(self, origin, dx, dy, count, writes):
+        self.origin = origin
+        self.dx = dx
+        self.dy = dy
+        self.count = count
+        self.writes = writes
+        self.box = self.bounds()
+
+    def color(self, key):
+        """Цвет клетки после всех повторов или None, если клетку шоссе не затрагивает."""
+        x, y = unpack(key - self.origin)
+        dx, dy = self.dx, self.dy
+        best, result = -1, None
+        # Клетку красит последний из повторов, в который она попадает
+        for (vx, vy), color in self.writes.items():
+            rx, ry = x - vx, y - vy
+            if dx:
+                n, rest = divmod(rx, dx)
+                if rest or n * dy != ry:
+                    continue
+            else:
+                n, rest = divmod(ry, dy)
+                if rest or rx:
+                    continue
+            if best < n < self.count:
+                best, result = n, color
+        return result
+
+    def bounds(self):
+        x0, y0 = unpack(self.origin)
+        xs = [x for x, _ in self.writes]
+        ys = [y for _, y in self.writes]
+        shift_x, shift_y = (self.count - 1) * self.dx, (self.count - 1) * self.dy
+        return (x0 + min(xs) + min(0, shift_x), y0 + min(ys) + min(0, shift_y),
+                x0 + max(xs) + max(0, shift_x), y0 + max(ys) + max(0, shift_y))
+
+
+class TurmiteWorld:
+    """
+    Неограниченное поле для одного или нескольких тьюрмитов.
+    Поле разреженное: словарь {упакованные координаты: цвет} хранит только
+    посещённые клетки, остальные считаются цветом 0. Участки, пройденные
+    ускоренным прогоном, хранятся сжато в списке highways.
+    """
+
+    def __init__(self, rules=RULES, turmites=None):
+        self.rules = rules
+        self.turmites = turmites if turmites is not None else [Turmite()]
+        self.grid = {}
+        self.highways = []
+        self.steps = 0
+        # Границы словаря и шоссе; новые ключи словаря добавляются в конец порядка обхода,
+        # поэтому учитываются только последние len(grid) - _boxed ключей
+        self._box = None
+        self._boxed = 0
+        self._compile()
+
+    def _compile(self):
+        # Таблица переходов table[состояние * 4 + направление][цвет] -> (новый цвет, новое
+        # состояние * 4 + новое направление, смещение ключа): один шаг — один поиск в списке
+        states = sorted({state for state, _ in self.rules}
+                        | {state for _, _, state in self.rules.values()}
+                        | {turmite.state for turmite in self.turmites})
+        colors = max([color for _, color in self.rules] + [color for color, _, _ in self.rules.values()]
+                     + list(COLOR_MAP)) + 1
+        self.states = states
+        self.state_index = {state: i for i, state in enumerate(states)}
+        self.table = []
+        for state in states:
+            for direction in range(4):
+                row = []
+                for cell in range(colors):
+                    color, turn, new_state = apply_rules(state, cell, self.rules)
+                    new_direction = (direction + turn) % 4
+                    row.append((color, self.state_index[new_state] * 4 + new_direction, DELTAS[new_direction]))
+                self.table.append(row)
+
+    def _lookup(self, key):
+        color = self.grid.get(key)
+        if color is not None:
+            return color
+        if not self.highways:
+            return 0
+        # Более поздние шоссе перекрывают более ранние
+        x, y = unpack(key)
+        for highway in reversed(self.highways):
+            min_x, min_y, max_x, max_y = highway.box
+            if min_x <= x <= max_x and min_y <= y <= max_y:
+                color = highway.color(key)
+                if color is not None:
+                    return color
+        return 0
+
+    def color(self, x, y):
+        return self._lookup(pack(x, y))
+
+    def set_color(self, x, y, color):
+        self.grid[pack(x, y)] = color
+
+    def cells(self):
+        """Посещённые клетки из словаря: (x, y, цвет). Клетки шоссе сюда не входят."""
+        for key, color in self.grid.items():
+            yield unpack(key) + (color,)
+
+    def bounds(self):
+        """(min_x, min_y, max_x, max_y) посещённых клеток и тьюрмитов."""
+        xs = [turmite.x for turmite in self.turmites]
+        ys = [turmite.y for turmite in self.turmites]
+        box = self._field_bounds()
+        if box is not None:
+            xs += [box[0], box[2]]
+            ys += [box[1], box[3]]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def _field_bounds(self):
+        # Границы клеток словаря и шоссе (None для пустого поля), обновляемые по новым ключам
+        fresh = len(self.grid) - self._boxed
+        if fresh > 0:
+            points = [unpack(key) for key in islice(reversed(self.grid), fresh)]
+            self._extend_box(min(x for x, _ in points), min(y for _, y in points),
+                             max(x for x, _ in points), max(y for _, y in points))
+        self._boxed = len(self.grid)
+        return self._box
+
+    def _extend_box(self, min_x, min_y, max_x, max_y):
+        if self._box is not None:
+            min_x, min_y = min(min_x, self._box[0]), min(min_y, self._box[1])
+            max_x, max_y = max(max_x, self._box[2]), max(max_y, self._box[3])
+        self._box = min_x, min_y, max_x, max_y
+
+    def window(self, x0, y0, width, height):
+        """Цвета прямоугольного участка поля: список строк."""
+        if self.highways:
+            lookup = self._lookup
+            return [[lookup(pack(x, y)) for x in range(x0, x0 + width)] for y in range(y0, y0 + height)]
+        get = self.grid.get
+        return [[get(pack(x, y), 0) for x in range(x0, x0 + width)] for y in range(y0, y0 + height)]
+
+    def step(self):
+        self.run(1)
+
+    def run(self, steps, snapshot_every=None, callback=None, macro=False):
+        """
+        Прогон без визуализации.
+        snapshot_every: Каждые столько шагов снимается snapshot(); снимки передаются в
+            callback, если он задан, и возвращаются списком.
+        macro: Искать периодическое движение и перескакивать через повторы (только для
+            одного тьюрмита); итоговое поле то же, что при пошаговом прогоне.
+        """
+        snapshots = []
+        while steps > 0:
+            block = min(steps, snapshot_every - self.steps % snapshot_every) if snapshot_every else steps
+            if macro and len(self.turmites) == 1:
+                self._run_macro(block)
+            elif len(self.turmites) == 1:
+                self._run_single(block)
+            else:
+                self._run_many(block)
+            self.steps += block
+            steps -= block
+            if snapshot_every and self.steps % snapshot_every == 0:
+                snapshot = self.snapshot()
+                snapshots.append(snapshot)
+                if callback is not None:
+                    callback(snapshot)
+        return snapshots
+
+    def _load(self, turmite):
+        return pack(turmite.x, turmite.y), self.state_index[turmite.state] * 4 + turmite.direction
+
+    def _store(self, turmite, key, state):
+        turmite.x, turmite.y = unpack(key)
+        turmite.state = self.states[state // 4]
+        turmite.direction = state % 4
+
+    def _run_single(self, steps):
+        # Самый горячий цикл: всё в локальных переменных
+        grid = self.grid
+        get = grid.get
+        table = self.table
+        turmite = self.turmites[0]
+        key, state = self._load(turmite)
+        if self.highways:
+            # Клетки, которых нет в словаре, могут лежать на шоссе
+            lookup = self._lookup
+            for _ in range(steps):
+                color = get(key)
+                if color is None:
+                    color = lookup(key)
+                color, state, delta = table[state][color]
+                grid[key] = color
+                key += delta
+        else:
+            for _ in range(steps):
+                color, state, delta = table[state][get(key, 0)]
+                grid[key] = color
+                key += delta
+        self._store(turmite, key, state)
+
+    def _run_many(self, steps):
+        # Тьюрмиты ходят по очереди в порядке списка
+        grid = self.grid
+        get = self._lookup if self.highways else grid.get
+        table = self.table
+        positions = [self._load(turmite) for turmite in self.turmites]
+        keys = [key for key, _ in positions]
+        states = [state for _, state in positions]
+        indices = range(len(keys))
+        for _ in range(steps):
+            for i in indices:
+                key = keys[i]
+                color, states[i], delta = table[states[i]][get(key) or 0]
+                grid[key] = color
+                keys[i] = key + delta
+        for turmite, key, state in zip(self.turmites, keys, states):
+            self._store(turmite, key, state)
+
+    def _run_macro(self, steps):
+        """
+        Ускоренный прогон одного тьюрмита. Отрезок из PROBE_STEPS шагов записывается,
+        в нём ищется период P со сдвигом D; затем проверяется, что каждый следующий
+        повтор прочитает те же цвета, что и записанный, и сколько повторов подряд это
+        верно. Допустимые повторы не моделируются, а добавляются сжатым шоссе (Highway).
+        Если скачок не окупает пробу (короче очередного блока), выполняются обычные
+        шаги блоками растущей длины, так что прогон не медленнее пошагового.
+        """
+        block = PROBE_STEPS
+        while steps > PROBE_STEPS:
+            keys, states, reads = self._probe(PROBE_STEPS)
+            steps -= PROBE_STEPS
+            jumped = 0
+            for period in self._periods(keys, states):
+                segment = self._segment(keys, reads, period)
+                repeats = self._safe_repeats(segment, steps // period)
+                if repeats:
+                    self._jump(segment, keys[-1], states[-1], repeats)
+                    jumped = repeats * period
+                    steps -= jumped
+                    break
+            if jumped < block:
+                run = min(steps, block)
+                self._run_single(run)
+                steps -= run
+                block = min(block * 2, MAX_BLOCK)
+        self._run_single(steps)
 
-    x, y = turmite_position
-    current_cell = grid[y][x]
+    def _probe(self, steps):
+        # Пошаговый прогон с записью положения, состояния и прочитанного цвета
+        grid = self.grid
+        get = grid.get
+        lookup = self._lookup
+        table = self.table
+        turmite = self.turmites[0]
+        key, state = self._load(turmite)
+        keys = [key]
+        states = [state]
+        reads = []
+        for _ in range(steps):
+            color = get(key)
+            if color is None:
+                color = lookup(key)
+            reads.append(color)
+            color, state, delta = table[state][color]
+            grid[key] = color
+            key += delta
+            keys.append(key)
+            states.append(state)
+        self._store(turmite, key, state)
+        return keys, states, reads
 
-    new_cell_color, turn_direction, new_state = apply_rules(turmite_state, current_cell)
-    grid[y][x] = new_cell_color
-    turmite_state = new_state
-    turmite_direction = (turmite_direction + turn_direction + 4) % 4
+    @staticmethod
+    def _periods(keys, states):
+        # Кандидаты P: последние два отрезка по P шагов совпадают по состояниям и сдвигам
+        end = len(keys) - 1
+        for period in range(1, min(MAX_PERIOD, end // 2) + 1):
+            if states[end] != states[end - period]:
+                continue
+            delta = keys[end] - keys[end - period]
+            if all(states[end - i] == states[end - period - i] and keys[end - i] - keys[end - period - i] == delta
+                   for i in range(1, period + 1)):
+                yield period
 
-    dx, dy = 0, 0
-    if turmite_direction == 0: dy = -1
-    elif turmite_direction == 1: dx = 1
-    elif turmite_direction == 2: dy = 1
-    elif turmite_direction == 3: dx = -1
+    def _segment(self, keys, reads, period):
+        """
+        Последний отрезок длиной period: начало, сдвиг (dx, dy), прочитанные до отрезка
+        цвета before и итоговые цвета after клеток отрезка (относительно начала), а также
+        hits — для каждой клетки x наименьшее j >= 1, при котором x + j * D снова
+        попадает в отрезок (None, если не попадает).
+        """
+        end = len(keys) - 1
+        origin = keys[end - period]
+        before = {}
+        for i in range(end - period, end):
+            before.setdefault(keys[i] - origin, reads[i])
+        after = {unpack(key): self._lookup(origin + key) for key in before}
+        before = {unpack(key): color for key, color in before.items()}
+        dx, dy = unpack(keys[end] - origin)
+
+        hits = {}
+        if dx or dy:
+            seg_x = [x for x, _ in before]
+            seg_y = [y for _, y in before]
+            seg_min_x, seg_max_x, seg_min_y, seg_max_y = min(seg_x), max(seg_x), min(seg_y), max(seg_y)
+            for x, y in before:
+                j = 1
+                while seg_min_x <= x + j * dx <= seg_max_x and seg_min_y <= y + j * dy <= seg_max_y:
+                    if (x + j * dx, y + j * dy) in before:
+                        break
+                    j += 1
+                hits[(x, y)] = j if (x + j * dx, y + j * dy) in before else None
+        return origin, (dx, dy), before, after, hits
+
+    def _safe_repeats(self, segment, limit):
+        """
+        Сколько (до limit) следующих повторов последнего отрезка гарантированно
+        совпадут с ним. Повтор n >= 1 читает клетку x (относительно своего начала)
+        в цвете after[x + hits[x] * D], если hits[x] <= n, а иначе — в исходном цвете
+        клетки x + n * D. Повтор верен, если для всех x этот цвет равен before[x].
+        Луч каждой клетки читается не дальше границ поля и не больше, чем позволяет
+        CHECK_CELLS на весь отрезок.
+        """
+        origin, (dx, dy), before, after, hits = segment
+        if dx == dy == 0:
+            return limit if before == after else 0
+        x0, y0 = unpack(origin)
+        min_x, min_y, max_x, max_y = self._field_bounds()
+        min_x, min_y, max_x, max_y = min_x - x0, min_y - y0, max_x - x0, max_y - y0
+        reach = max(1, CHECK_CELLS // len(before))
+
+        safe = limit
+        for (x, y), color in before.items():
+            hit = hits[(x, y)]
+            # До попадания клетки луча ещё не тронуты: сравниваем с текущим полем
+            n = 1
+            while (hit is None or n < hit) and n <= safe:
+                cx, cy = x + n * dx, y + n * dy
+                if not (min_x <= cx <= max_x and min_y <= cy <= max_y):
+                    # Дальше по лучу только пустые клетки
+                    if color:
+                        safe = n - 1
+                    break
+                if n > reach or self._lookup(origin + pack(cx, cy)) != color:
+                    safe = n - 1
+                    break
+                n += 1
+            if hit is not None and hit <= safe and after[(x + hit * dx, y + hit * dy)] != color:
+                safe = hit - 1
+            if safe < 1:
+                return 0
+        return safe
+
+    def _jump(self, segment, key, state, repeats):
+        origin, (dx, dy), _, after, hits = segment
+        if dx == dy == 0:
+            # Тьюрмит ходит по замкнутому циклу, не меняя поле: повторы ничего не меняют
+            return
+        grid = self.grid
+        delta = pack(dx, dy)
+        writes = [(pack(x, y), color) for (x, y), color in after.items()]
+        if repeats * len(writes) <= MAX_FOLDED_CELLS:
+            # Короткое шоссе дешевле записать в словарь: поиск по шоссе в _lookup
+            # тогда не растёт с их числом. Поздние повторы перекрывают ранние
+            for n in range(1, repeats + 1):
+                start = origin + n * delta
+                for cell, color in writes:
+                    grid[start + cell] = color
+        else:
+            highway = Highway(origin + delta, dx, dy, repeats, after)
+            # Клетки словаря под шоссе перекрашиваются его повторами. Все они лежат на
+            # лучах x + n * D клеток отрезка до первого попадания луча в отрезок
+            # и внутри границ поля
+            min_x, min_y, max_x, max_y = self._field_bounds()
+            x0, y0 = unpack(origin)
+            for x, y in after:
+                hit = hits[(x, y)]
+                last = repeats if hit is None else min(hit, repeats)
+                for n in range(1, last + 1):
+                    cx, cy = x0 + x + n * dx, y0 + y + n * dy
+                    if not (min_x <= cx <= max_x and min_y <= cy <= max_y):
+                        break
+                    grid.pop(pack(cx, cy), None)
+            self.highways.append(highway)
+            self._extend_box(*highway.box)
+            # Последний повтор кладём в словарь: следующие шаги читают именно его
+            last = origin + repeats * delta
+            for cell, color in writes:
+                grid[last + cell] = color
+            self._boxed = len(grid)
+        self._store(self.turmites[0], key + repeats * delta, state)
+
+    def snapshot(self):
+        return {
+            'step': self.steps,
+            'grid': dict(self.grid),
+            'highways': list(self.highways),
+            'turmites': [(turmite.x, turmite.y, turmite.state, turmite.direction) for turmite in self.turmites],
+        }
+
+
+# Начальное состояние автомата: окно GRID_SIZE x GRID_SIZE с тьюрмитом в центре
+world = TurmiteWorld()
+origin = -(GRID_SIZE // 2)
+
+# Пауза между кадрами (мс) и число шагов автомата за кадр по умолчанию
+FRAME_INTERVAL = 16
+STEPS_PER_FRAME = 100
+
+# Элементы холста создаются один раз и затем только перекрашиваются
+cell_items = []
+turmite_items = []
+drawn = []
+after_id = None
+
+
+def move_turmite():
+    world.step()
 
-    turmite_position[0] = (x + dx + GRID_SIZE) % GRID_SIZE
-    turmite_position[1] = (y + dy + GRID_SIZE) % GRID_SIZE
 
 def reset():
-    global grid, turmite_position, turmite_state, turmite_direction
-    grid = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-    turmite_position = [GRID_SIZE // 2, GRID_SIZE // 2]
-    turmite_state = 'A'
-    turmite_direction = 0
+    global world
+    world = TurmiteWorld()
 
-def update():
-    move_turmite()
-    canvas.delete("all")
-    draw_grid()
-    window.after(1, update)
 
-def draw_grid():
+def create_grid():
     for y in range(GRID_SIZE):
-        for x in range(GRID_SIZE):
-            color = COLOR_MAP[grid[y][x]]
+        cell_items.append([
             canvas.create_rectangle(
                 x * CELL_SIZE, y * CELL_SIZE,
                 (x + 1) * CELL_SIZE, (y + 1) * CELL_SIZE,
-                fill=color, outline="darkgray"
+                fill=COLOR_MAP[0], outline="darkgray"
             )
-    x, y = turmite_position
-    canvas.create_rectangle(
-        x * CELL_SIZE, y * CELL_SIZE,
-        (x + 1) * CELL_SIZE, (y + 1) * CELL_SIZE,
-        fill="magenta"
-    )
-
-# Инициализация окна
-window = tk.Tk()
-window.title("Клеточный автомат")
-canvas = tk.Canvas(window, width=GRID_SIZE * CELL_SIZE, height=GRID_SIZE * CELL_SIZE, bg="white")
-canvas.pack()
-
-# Кнопки управления
-control_frame = tk.Frame(window)
-control_frame.pack()
-
-start_button = tk.Button(control_frame, text="Старт", command=lambda: update())
-start_button.pack(side=tk.LEFT)
-
-stop_button = tk.Button(control_frame, text="Стоп", command=lambda: window.after_cancel(update))
-stop_button.pack(side=tk.LEFT)
-
-reset_button = tk.Button(control_frame, text="Сброс", command=lambda: [reset(), draw_grid()])
-reset_button.pack(side=tk.LEFT)
-
-# Запуск программы
-reset()
-draw_grid()
-window.mainloop()
+            for x in range(GRID_SIZE)
+        ])
+        drawn.append([0] * GRID_SIZE)
+
+
+def draw_grid(full=False):
+    # Перекрашиваем только клетки, цвет которых изменился с прошлого кадра
+    cells = world.window(origin, origin, GRID_SIZE, GRID_SIZE)
+    for y, (row, drawn_row, items) in enumerate(zip(cells, drawn, cell_items)):
+        for x, color in enumerate(row):
+            if full or color != drawn_row[x]:
+                canvas.itemconfig(items[x], fill=COLOR_MAP[color])
+                drawn_row[x] = color
+
+    while len(turmite_items) < len(world.turmites):
+        turmite_items.append(canvas.create_rectangle(0, 0, CELL_SIZE, CELL_SIZE, fill="magenta"))
+    for item, turmite in zip(turmite_items, world.turmites):
+        x, y = turmite.x - origin, turmite.y - origin
+        if 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE:
+            canvas.coords(item, x * CELL_SIZE, y * CELL_SIZE, (x + 1) * CELL_SIZE, (y + 1) * CELL_SIZE)
+            canvas.itemconfig(item, state=tk.NORMAL)
+        else:
+            canvas.itemconfig(item, state=tk.HIDDEN)
+
+
+def frame_steps():
+    # Пока поле ввода редактируется, в нём может быть не число
+    try:
+        return max(1, steps_per_frame.get())
+    except tk.TclError:
+        return STEPS_PER_FRAME
+
+
+def update():
+    global after_id
+    world.run(frame_steps())
+    draw_grid()
+    after_id = window.after(FRAME_INTERVAL, update)
+
+
+def start():
+    if after_id is None:
+        update()
+
+
+def stop():
+    global after_id
+    if after_id is not None:
+        window.after_cancel(after_id)
+        after_id = None
+
+
+if __name__ == "__main__":
+    # Инициализация окна
+    window = tk.Tk()
+    window.title("Клеточный автомат")
+    canvas = tk.Canvas(window, width=GRID_SIZE * CELL_SIZE, height=GRID_SIZE * CELL_SIZE, bg="white")
+    canvas.pack()
+
+    # Кнопки управления
+    control_frame = tk.Frame(window)
+    control_frame.pack()
+
+    start_button = tk.Button(control_frame, text="Старт", command=start)
+    start_button.pack(side=tk.LEFT)
+
+    stop_button = tk.Button(control_frame, text="Стоп", command=stop)
+    stop_button.pack(side=tk.LEFT)
+
+    reset_button = tk.Button(control_frame, text="Сброс", command=lambda: [reset(), draw_grid(full=True)])
+    reset_button.pack(side=tk.LEFT)
+
+    # Сколько шагов автомата выполняется между перерисовками
+    tk.Label(control_frame, text="Шагов за кадр:").pack(side=tk.LEFT)
+    steps_per_frame = tk.IntVar(value=STEPS_PER_FRAME)
+    tk.Spinbox(control_frame, from_=1, to=100000, increment=100, width=7,
+               textvariable=steps_per_frame).pack(side=tk.LEFT)
+
+    # Запуск программы
+    reset()
+    create_grid()
+    draw_grid(full=True)
+    window.mainloop()
@@ -1,114 +1,405 @@
+import asyncio
+import contextlib
+import math
+import threading
+import time
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-import time
+
+THINKING = 0
+EATING = 1
+
+# Размер стека потока в режиме threads: тысячи потоков со стеком по умолчанию
+# занимают гигабайты виртуальной памяти
+THREAD_STACK_SIZE = 256 * 1024
+
 
 # Инициализация сети Петри
 class PetriNet:
-    def __init__(self):
-        # Инициализация состояний
-        self.philosophers = {f"P{i}": "thinking" for i in range(1, 6)}  # "thinking" или "eating"
-        self.chopsticks = {f"C{i}": "free" for i in range(1, 6)}  # "free" или "taken"
-        self.token_position = "P1"  # Начальная позиция токена (мудрец 1)
+    def __init__(self, n=5):
+        # Инициализация состояний: мудрец i сидит между палочками i (левая) и (i + 1) % n (правая)
+        self.n = n
+        self.philosophers = np.full(n, THINKING, dtype=np.int8)  # THINKING или EATING
+        self.chopsticks = np.zeros(n, dtype=bool)  # True — палочка занята
+        self.meals = np.zeros(n, dtype=np.int64)
+        self.token_position = 0  # Начальная позиция токена (мудрец 0)
+        self.steps = 0
 
     def try_eat(self, philosopher):
         """Попытка начать есть для указанного мудреца."""
-        left = f"C{philosopher[-1]}"  # Левая палочка
-        right = f"C{(int(philosopher[-1]) % 5) + 1}"  # Правая палочка
+        left = philosopher
+        right = (philosopher + 1) % self.n
 
         # Проверяем, свободны ли обе палочки
-        if self.chopsticks[left] == "free" and self.chopsticks[right] == "free":
-            self.philosophers[philosopher] = "eating"
-            self.chopsticks[left] = "taken"
-            self.chopsticks[right] = "taken"
+        if not self.chopsticks[left] and not self.chopsticks[right]:
+            self.philosophers[philosopher] = EATING
+            self.chopsticks[left] = True
+            self.chopsticks[right] = True
+            self.meals[philosopher] += 1
             return True
         return False
 
     def stop_eat(self, philosopher):
         """Завершение еды для указанного мудреца."""
-        left = f"C{philosopher[-1]}"  # Левая палочка
-        right = f"C{(int(philosopher[-1]) % 5) + 1}"  # Правая палочка
-
-        self.philosophers[philosopher] = "thinking"
-        self.chopsticks[left] = "free"
-        self.chopsticks[right] = "free"
+        self.philosophers[philosopher] = THINKING
+        self.chopsticks[philosopher] = False
+        self.chopsticks[(philosopher + 1) % self.n] = False
 
     def get_next_philosopher(self, current):
         """Возвращает следующего мудреца по кругу."""
-        current_id = int(current[-1])
-        next_id = (current_id % 5) + 1
-        return f"P{next_id}"
-
-
-# Инициализация визуализации
-fig, ax = plt.subplots(figsize=(8, 8))
-ax.set_xlim(-1.5, 1.5)
-ax.set_ylim(-1.5, 1.5)
-ax.set_aspect("equal")
-ax.axis("off")
-
-# Координаты мудрецов и палочек
-philosophers = {
-    "P1": (1, 0), "P2": (0.5, 0.866), "P3": (-0.5, 0.866),
-    "P4": (-1, 0), "P5": (-0.5, -0.866)
-}
-chopsticks = {
-    "C1": (0.75, 0.433), "C2": (0, 0.866), "C3": (-0.75, 0.433),
-    "C4": (-0.75, -0.433), "C5": (0, -0.866)
-}
-
-# Инициализация визуальных элементов
-philosopher_patches = {}
-chopstick_patches = {}
-token = None
-
-for phil, (x, y) in philosophers.items():
-    rect = patches.Rectangle((x - 0.15, y - 0.1), 0.3, 0.2, edgecolor="black", facecolor="white", lw=1.5)
-    philosopher_patches[phil] = rect
-    ax.add_patch(rect)
-    ax.text(x, y + 0.15, phil, ha="center", va="center", fontsize=9)
-
-for chop, (x, y) in chopsticks.items():
-    circle = patches.Circle((x, y), 0.1, edgecolor="black", facecolor="lightgray", lw=1.5)
-    chopstick_patches[chop] = circle
-    ax.add_patch(circle)
-    ax.text(x, y + 0.15, chop, ha="center", va="center", fontsize=9)
-
-token_position = "P1"
-x, y = philosophers[token_position]
-token = patches.Circle((x, y), 0.1, edgecolor="black", facecolor="red", lw=1.5)
-ax.add_patch(token)
-
-plt.draw()
-
-# Функция обновления диаграммы
-def update_diagram(net):
-    """Обновление состояния сети Петри на диаграмме."""
-    for phil, state in net.philosophers.items():
-        color = "green" if state == "eating" else "white"
-        philosopher_patches[phil].set_facecolor(color)
-
-    for chop, state in net.chopsticks.items():
-        color = "lightgray" if state == "free" else "gray"
-        chopstick_patches[chop].set_facecolor(color)
-
-    # Перемещение токена
-    x, y = philosophers[net.token_position]
-    token.set_center((x, y))
-    fig.canvas.draw_idle()
-    plt.pause(0.5)
-
-
-# Логика работы сети Петри
-net = PetriNet()
-while True:
-    current_philosopher = net.token_position
-
-    # Попытка начать есть
-    if net.try_eat(current_philosopher):
-        update_diagram(net)
-        time.sleep(2)  # Задержка во время еды
-        net.stop_eat(current_philosopher)
-
-    # Переход к следующему мудрецу
-    net.token_position = net.get_next_philosopher(current_philosopher)
-    update_diagram(net)
+        return (current + 1) % self.n
+
+    def step(self):
+        """
+        Один шаг сети: мудрец с токеном либо начинает есть (токен остаётся у него),
+        либо заканчивает еду или не может начать — и токен переходит дальше.
+        Возвращает True, если на этом шаге мудрец начал есть.
+        """
+        current = self.token_position
+        self.steps += 1
+        if self.philosophers[current] == EATING:
+            self.stop_eat(current)
+        elif self.try_eat(current):
+            return True
+        self.token_position = self.get_next_philosopher(current)
+        return False
+
+    def run(self, steps):
+        """Прогон без визуализации; возвращает число съеденных порций по мудрецам."""
+        for _ in range(steps):
+            self.step()
+        return self.meals
+
+
+def contention_report(meals, max_waits, elapsed):
+    """
+    Метрики конкурентного прогона.
+    meals: Число порций по мудрецам.
+    max_waits: Наибольшее время (с) между началом ожидания палочек и едой по мудрецам,
+        включая ожидание, не закончившееся к остановке (см. _fold_waiting);
+        мудрец, так и не поевший, считается ждавшим весь прогон.
+    elapsed: Длительность прогона в секундах.
+    """
+    meals = np.asarray(meals, dtype=np.float64)
+    total = float(meals.sum())
+    return {
+        'philosophers': len(meals),
+        'meals': int(total),
+        'elapsed': elapsed,
+        'throughput': total / elapsed if elapsed else 0.0,
+        # Индекс справедливости Джайна: 1 — все ели поровну, 1/n — ел один
+        'fairness': total ** 2 / (len(meals) * float((meals ** 2).sum())) if total else 0.0,
+        'min_meals': int(meals.min()),
+        'max_meals': int(meals.max()),
+        'starved': int((meals == 0).sum()),
+        'max_wait': elapsed if (meals == 0).any() else float(max(max_waits)),
+    }
+
+
+def _fold_waiting(max_waits, hungry, stopped):
+    """Добавляет в max_waits ожидание мудрецов, которые к остановке так и не получили палочки."""
+    for i, since in enumerate(hungry):
+        if since is not None:
+            max_waits[i] = max(max_waits[i], stopped - since)
+
+
+def _chopsticks(i, n, locks):
+    """Замки палочек мудреца i в порядке номеров."""
+    first, second = sorted((i, (i + 1) % n))
+    # При n = 1 левая и правая палочки совпадают, а замок нельзя взять дважды
+    return locks[first], locks[second] if second != first else contextlib.nullcontext()
+
+
+def _philosopher_thread(i, n, locks, meals, max_waits, hungry, start, stop, think_time, eat_time):
+    # Палочки берутся в порядке номеров, поэтому кругового ожидания нет
+    first, second = _chopsticks(i, n, locks)
+    start.wait()
+    while not stop.is_set():
+        with first, second:
+            # Палочки, полученные после остановки, уже не еда: ожидание досчитает _fold_waiting
+            if stop.is_set():
+                break
+            max_waits[i] = max(max_waits[i], time.perf_counter() - hungry[i])
+            hungry[i] = None
+            meals[i] += 1
+            time.sleep(eat_time)
+        time.sleep(think_time)
+        hungry[i] = time.perf_counter()
+
+
+def run_threads(n=5, duration=1.0, think_time=0.0, eat_time=0.0):
+    """Мудрецы как потоки ОС, палочки — threading.Lock."""
+    locks = [threading.Lock() for _ in range(n)]
+    meals = [0] * n
+    max_waits = [0.0] * n
+    # Начало текущего ожидания палочек по мудрецам; None — мудрец ест или размышляет
+    hungry = [0.0] * n
+    # Все потоки ждут общего старта: иначе запуск тысяч потоков конкурирует за GIL с уже едящими
+    start = threading.Event()
+    stop = threading.Event()
+
+    previous = threading.stack_size(THREAD_STACK_SIZE)
+    try:
+        threads = [threading.Thread(target=_philosopher_thread,
+                                    args=(i, n, locks, meals, max_waits, hungry, start, stop, think_time, eat_time))
+                   for i in range(n)]
+        # Размер стека применяется при start(), поэтому прежний восстанавливается после запуска
+        for thread in threads:
+            thread.start()
+    finally:
+        threading.stack_size(previous)
+
+    # Мудрецы голодны с момента общего старта, даже если поток получил управление позже
+    started = time.perf_counter()
+    hungry[:] = [started] * n
+    start.set()
+    time.sleep(duration)
+    stop.set()
+    stopped = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    _fold_waiting(max_waits, hungry, stopped)
+    return contention_report(meals, max_waits, stopped - started)
+
+
+async def _philosopher_task(i, n, locks, meals, max_waits, hungry, stop, think_time, eat_time):
+    first, second = _chopsticks(i, n, locks)
+    while not stop.is_set():
+        async with first, second:
+            if stop.is_set():
+                break
+            max_waits[i] = max(max_waits[i], time.perf_counter() - hungry[i])
+            hungry[i] = None
+            meals[i] += 1
+            await asyncio.sleep(eat_time)
+        await asyncio.sleep(think_time)
+        hungry[i] = time.perf_counter()
+
+
+async def _run_tasks(n, duration, think_time, eat_time):
+    locks = [asyncio.Lock() for _ in range(n)]
+    meals = [0] * n
+    max_waits = [0.0] * n
+    stop = asyncio.Event()
+
+    started = time.perf_counter()
+    hungry = [started] * n
+    tasks = [asyncio.create_task(_philosopher_task(i, n, locks, meals, max_waits, hungry, stop, think_time, eat_time))
+             for i in range(n)]
+    await asyncio.sleep(duration)
+    stop.set()
+    stopped = time.perf_counter()
+    await asyncio.gather(*tasks)
+    _fold_waiting(max_waits, hungry, stopped)
+    return contention_report(meals, max_waits, stopped - started)
+
+
+def run_asyncio(n=5, duration=1.0, think_time=0.0, eat_time=0.0):
+    """Мудрецы как задачи asyncio, палочки — asyncio.Lock."""
+    return asyncio.run(_run_tasks(n, duration, think_time, eat_time))
+
+
+def run_contention(n=5, mode='threads', duration=1.0, think_time=0.0, eat_time=0.0):
+    """
+    Конкурентный прогон: мудрецы борются за палочки-замки.
+    mode: 'threads' или 'asyncio'.
+    think_time, eat_time: Длительность размышления и еды в секундах.
+    Возвращает словарь contention_report.
+    """
+    if mode == 'threads':
+        return run_threads(n, duration, think_time, eat_time)
+    if mode == 'asyncio':
+        return run_asyncio(n, duration, think_time, eat_time)
+    raise ValueError(f"Неизвестный режим: {mode}")
+
+
+def table_positions(n, radius=1.0):
+    """Координаты мудрецов и палочек по кругу."""
+    philosophers = [(radius * math.cos(2 * math.pi * i / n), radius * math.sin(2 * math.pi * i / n))
+                    for i in range(n)]
+    chopsticks = [(radius * math.cos(2 * math.pi * (i + 0.5) / n), radius * math.sin(2 * math.pi * (i + 0.5) / n))
+                  for i in range(n)]
+    # Палочка i — левая для мудреца i, то есть между мудрецами i - 1 и i
+    return philosophers, chopsticks[-1:] + chopsticks[:-1]
+
+
+def draw_table(net):
+    """Создаёт фигуру и визуальные элементы; возвращает (fig, philosopher_patches, chopstick_patches, token)."""
+    fig, ax = plt.subplots(figsize=(8, 8))
+    ax.set_xlim(-1.5, 1.5)
+    ax.set_ylim(-1.5, 1.5)
+    ax.set_aspect("equal")
+    ax.axis("off")
+
+    philosophers, chopsticks = table_positions(net.n)
+    size = min(1.0, 5 / net.n)
+    labelled = net.n <= 30
+
+    # Инициализация визуальных элементов
+    philosopher_patches = []
+    chopstick_patches = []
+    for i, (x, y) in enumerate(philosophers):
+        rect = patches.Rectangle((x - 0.15 * size, y - 0.1 * size), 0.3 * size, 0.2 * size,
+                                 edgecolor="black", facecolor="white", lw=1.5)
+        philosopher_patches.append(rect)
+        ax.add_patch(rect)
+        if labelled:
+            ax.text(x, y + 0.15 * size, f"P{i + 1}", ha="center", va="center", fontsize=9)
+
+    for i, (x, y) in enumerate(chopsticks):
+        circle = patches.Circle((x, y), 0.1 * size, edgecolor="black", facecolor="lightgray", lw=1.5)
+        chopstick_patches.append(circle)
+        ax.add_patch(circle)
+        if labelled:
+            ax.text(x, y + 0.15 * size, f"C{i + 1}", ha="center", va="center", fontsize=9)
+
+    token = patches.Circle(philosophers[net.token_position], 0.1 * size, edgecolor="black", facecolor="red", lw=1.5)
+    ax.add_patch(token)
+    return fig, philosopher_patches, chopstick_patches, token
+
+
+class SnapshotBuffer:
+    """
+    Кольцевой буфер снимков состояния сети: модель пишет в него на полной скорости,
+    визуализация читает последний снимок. Массивы выделяются заранее.
+    """
+
+    def __init__(self, n, capacity=256):
+        self.capacity = capacity
+        self.steps = np.zeros(capacity, dtype=np.int64)
+        self.philosophers = np.zeros((capacity, n), dtype=np.int8)
+        self.chopsticks = np.zeros((capacity, n), dtype=bool)
+        self.tokens = np.zeros(capacity, dtype=np.int64)
+        self.written = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return min(self.written, self.capacity)
+
+    def publish(self, net):
+        with self.lock:
+            slot = self.written % self.capacity
+            self.steps[slot] = net.steps
+            self.philosophers[slot] = net.philosophers
+            self.chopsticks[slot] = net.chopsticks
+            self.tokens[slot] = net.token_position
+            self.written += 1
+
+    def latest(self):
+        """Последний снимок (step, philosophers, chopsticks, token_position) или None."""
+        with self.lock:
+            if not self.written:
+                return None
+            slot = (self.written - 1) % self.capacity
+            return (int(self.steps[slot]), self.philosophers[slot].copy(),
+                    self.chopsticks[slot].copy(), int(self.tokens[slot]))
+
+
+def run_model(net, buffer, stop, steps_per_second=None):
+    """
+    Цикл модели без визуализации: шаги сети публикуются в буфер, пока не выставлен stop.
+    steps_per_second: Ограничение скорости; None — на полной скорости.
+    """
+    started = time.perf_counter()
+    while not stop.is_set():
+        net.step()
+        buffer.publish(net)
+        if steps_per_second:
+            delay = started + net.steps / steps_per_second - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+
+class Renderer:
+    """
+    Визуализация с пропуском кадров: по таймеру с частотой fps берётся последний
+    снимок из буфера, и перерисовываются (blit) только изменившиеся фигуры.
+    """
+
+    def __init__(self, net, buffer, fps=30):
+        self.buffer = buffer
+        self.fig, self.philosopher_patches, self.chopstick_patches, self.token = draw_table(net)
+        self.ax = self.token.axes
+        self.philosophers = net.philosophers.copy()
+        self.chopsticks = net.chopsticks.copy()
+        self.token_position = net.token_position
+        self.step = net.steps
+
+        # Счётчик шагов в отдельной области, фон которой восстанавливается перед выводом
+        self.status_ax = self.fig.add_axes([0, 0.93, 1, 0.05])
+        self.status_ax.axis("off")
+        self.status = self.status_ax.text(0.5, 0.5, "", ha="center", va="center", animated=True)
+        self.status_background = None
+        self.fig.canvas.mpl_connect('draw_event', self.on_draw)
+
+        self.timer = self.fig.canvas.new_timer(interval=max(1, int(1000 / fps)))
+        self.timer.add_callback(self.frame)
+
+    def on_draw(self, event):
+        # Полная перерисовка (первый показ, изменение размера окна): запоминаем фон строки состояния
+        self.status_background = self.fig.canvas.copy_from_bbox(self.status_ax.bbox)
+        self.status_ax.draw_artist(self.status)
+
+    def frame(self):
+        snapshot = self.buffer.latest()
+        if snapshot is None or self.status_background is None or snapshot[0] == self.step:
+            return
+        self.step, philosophers, chopsticks, token_position = snapshot
+        canvas = self.fig.canvas
+
+        changed = set(np.flatnonzero(philosophers != self.philosophers))
+        for i in changed:
+            self.philosopher_patches[i].set_facecolor("green" if philosophers[i] == EATING else "white")
+        if token_position != self.token_position:
+            # Прямоугольник под старым положением токена стирает токен
+            changed.add(self.token_position)
+            self.token.set_center(self.philosopher_patches[token_position].get_center())
+        for i in changed:
+            self.ax.draw_artist(self.philosopher_patches[i])
+
+        for i in np.flatnonzero(chopsticks != self.chopsticks):
+            patch = self.chopstick_patches[i]
+            patch.set_facecolor("gray" if chopsticks[i] else "lightgray")
+            self.ax.draw_artist(patch)
+
+        self.ax.draw_artist(self.token)
+        self.philosophers, self.chopsticks, self.token_position = philosophers, chopsticks, token_position
+
+        canvas.restore_region(self.status_background)
+        self.status.set_text(f"шаг {self.step:,}")
+        self.status_ax.draw_artist(self.status)
+        canvas.blit(self.ax.bbox)
+        canvas.blit(self.status_ax.bbox)
+
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+
+def animate(n=5, fps=30, steps_per_second=None, capacity=256):
+    """
+    Анимация сети: модель работает в отдельном потоке на полной скорости
+    (или с ограничением steps_per_second), окно обновляется с частотой fps.
+    """
+    net = PetriNet(n)
+    buffer = SnapshotBuffer(n, capacity)
+    stop = threading.Event()
+    renderer = Renderer(net, buffer, fps)
+    model = threading.Thread(target=run_model, args=(net, buffer, stop, steps_per_second), daemon=True)
+    renderer.fig.canvas.mpl_connect('close_event', lambda event: stop.set())
+
+    model.start()
+    renderer.start()
+    plt.show()
+    stop.set()
+    renderer.stop()
+    model.join()
+    return net
+
+
+if __name__ == "__main__":
+    net = animate(n=5, fps=30)
+    print(f"Шагов: {net.steps}, порций: {net.meals.tolist()}")
@@ -0,0 +1,132 @@
+import math
+from scipy import stats
+
+
+def mmnk(lam, mu, n, capacity):
+    """
+    Стационарные характеристики СМО M/M/n/K.
+
+    lam: Интенсивность потока заявок.
+    mu: Интенсивность обслуживания одним каналом.
+    n: Число каналов.
+    capacity: Максимальное число заявок в системе K (n + длина очереди).
+    Возвращает словарь с распределением p_k и метриками.
+    """
+    if capacity < n:
+        n = capacity
+    a = lam / mu
+
+    # p_k ~ a^k / k! при k <= n и a^n / n! * (a / n)^(k - n) при k > n
+    weights = [1.0]
+    for k in range(1, capacity + 1):
+        weights.append(weights[-1] * a / min(k, n))
+    total = sum(weights)
+    p = [weight / total for weight in weights]
+
+    rejection = p[capacity]
+    throughput = lam * (1 - rejection)
+    queue_length = sum((k - n) * p[k] for k in range(n + 1, capacity + 1))
+    in_system = sum(k * p[k] for k in range(capacity + 1))
+    return {
+        'p': p,
+        'rejection_probability': rejection,
+        'throughput': throughput,
+        'mean_queue_length': queue_length,
+        'mean_in_system': in_system,
+        'utilisation': throughput / (mu * n) if n else 0.0,
+        # Формула Литтла
+        'mean_waiting_time': queue_length / throughput if throughput else 0.0,
+        'mean_sojourn_time': in_system / throughput if throughput else 0.0,
+    }
+
+
+def mgnk_approx(lam, mu, n, capacity, service_cv2):
+    """
+    Приближение M/G/n/K по Аллену—Каннену: вероятность отказа берётся из M/M/n/K,
+    а очередь и ожидание умножаются на (1 + Cs^2) / 2.
+    service_cv2: Квадрат коэффициента вариации времени обслуживания
+        (0 для детерминированного, M/D/n).
+    """
+    result = mmnk(lam, mu, n, capacity)
+    factor = (1 + service_cv2) / 2
+    result['mean_queue_length'] *= factor
+    result['mean_waiting_time'] *= factor
+    result['mean_in_system'] = result['mean_queue_length'] + result['throughput'] / mu
+    result['mean_sojourn_time'] = result['mean_waiting_time'] + 1 / mu
+    return result
+
+
+def fsm_system_metrics(num_processors, max_queue_length, max_treatment_time, my_lambda, tiks_per_second, **_):
+    """
+    Аналитическое приближение для FSMSystem / EventFSMSystem (smo/sno.py).
+    Все величины в тиках.
+    """
+    # Интервал между заявками: int(Exp(lambda) * tps) + 1 тик — геометрическое распределение
+    q = math.exp(-my_lambda / tiks_per_second)
+    lam = 1 - q
+    # Время обслуживания равномерно на 1..max_treatment_time
+    mean_service = (max_treatment_time + 1) / 2
+    variance = (max_treatment_time ** 2 - 1) / 12
+    result = mgnk_approx(lam, 1 / mean_service, num_processors, num_processors + max_queue_length,
+                         variance / mean_service ** 2)
+    # Заявка попадает на процессор не раньше следующего тика, поэтому лишний тик стоит в очереди,
+    # но в waiting_time (tik - arrival_time - 1) он не входит
+    result['mean_queue_length'] = result['throughput'] * (result['mean_waiting_time'] + 1)
+    # FSMSystem отмечает процессор как BUSY на тик меньше длительности обслуживания
+    result['utilisation'] = result['throughput'] * (mean_service - 1) / num_processors
+    return result
+
+
+def petri_metrics(num_processors, max_treatment_time, my_lambda, max_queue_length, tiks_per_second=50, **_):
+    """
+    Аналитическое приближение M/D/n/K для simulate_smo (smo_petri/smo_petri.py),
+    где каждая заявка обслуживается ровно max_treatment_time тиков.
+    """
+    # Интервал между заявками: round(Exp(lambda) * tps) + 1 тик
+    rate = my_lambda / tiks_per_second
+    q = math.exp(-rate)
+    mean_gap = 1 + math.exp(rate / 2) * q / (1 - q)
+    return mgnk_approx(1 / mean_gap, 1 / max_treatment_time, num_processors,
+                       num_processors + max_queue_length, 0.0)
+
+
+def summarize(results, confidence=0.95):
+    # Среднее и доверительный интервал Стьюдента по каждой метрике
+    n = len(results)
+    quantile = float(stats.t.ppf((1 + confidence) / 2, n - 1)) if n > 1 else 0.0
+    summary = {'replications': n}
+    for metric in results[0]:
+        values = [result[metric] for result in results]
+        mean = sum(values) / n
+        std = math.sqrt(sum((value - mean) ** 2 for value in values) / (n - 1)) if n > 1 else 0.0
+        half_width = quantile * std / math.sqrt(n)
+        summary[metric] = {'mean': mean, 'ci': (mean - half_width, mean + half_width)}
+    return summary
+
+
+def validate(simulated, analytical, tolerance=0.1, absolute=1e-3,
+             metrics=('rejection_probability', 'mean_queue_length', 'utilisation', 'mean_waiting_time')):
+    """
+    Сравнивает результаты симуляции с аналитикой.
+    simulated: Словарь statistics() одного прогона или summarize() по повторам.
+    tolerance: Допустимая относительная ошибка.
+    absolute: Допустимая абсолютная ошибка для метрик, близких к нулю.
+    Возвращает {метрика: (симуляция, аналитика, относительная ошибка, в пределах допуска)}.
+    """
+    report = {}
+    for metric in metrics:
+        value = simulated[metric]
+        if isinstance(value, dict):
+            value = value['mean']
+        expected = analytical[metric]
+        difference = abs(value - expected)
+        error = difference / abs(expected) if expected else (math.inf if difference else 0.0)
+        report[metric] = (value, expected, error, difference <= max(tolerance * abs(expected), absolute))
+    return report
+
+
+if __name__ == "__main__":
+    params = dict(num_processors=2, max_queue_length=10, max_treatment_time=20, my_lambda=2, tiks_per_second=10)
+    for metric, value in fsm_system_metrics(**params).items():
+        if metric != 'p':
+            print(f"{metric}: {value:.4f}")
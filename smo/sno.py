@@ -1,10 +1,17 @@
+import heapq
 import math
+import os
 import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
 from scipy import stats
 from matplotlib import pyplot as plt
 from matplotlib import patches
 from matplotlib.animation import FuncAnimation
 from enum import Enum, auto
+from analytic import fsm_system_metrics, summarize, validate
 
 class ProcessorState(Enum):
     IDLE = auto()
@@ -12,8 +19,9 @@ class ProcessorState(Enum):
     COMPLETE = auto()
 
 class Request:
-    def __init__(self, treatment_time):
+    def __init__(self, treatment_time, arrival_time=0):
         self.treatment_time = treatment_time
+        self.arrival_time = arrival_time
         self.waiting_time = 0
 
 class ProcessorFSM:
@@ -46,8 +54,9 @@ class ProcessorFSM:
         return None
 
 class FSMSystem:
-    def __init__(self, num_processors, max_queue_length, max_treatment_time, full_time, my_lambda, tiks_per_second):
-        self.queue = []
+    def __init__(self, num_processors, max_queue_length, max_treatment_time, full_time, my_lambda, tiks_per_second,
+                 record_history=True):
+        self.queue = deque()
         self.rejected_requests = []
         self.completed_requests = []
         self.processors = [ProcessorFSM() for _ in range(num_processors)]
@@ -57,35 +66,49 @@ class FSMSystem:
         self.full_time = full_time
         self.lambda_ = my_lambda
         self.tiks_per_second = tiks_per_second
-        self.time_points = []
-        self.processor_states = [[] for _ in range(num_processors)]
-        self.requests_in_queue = []
-        self.requests_completed = []
-        self.requests_rejected = []
         self.time_to_next_request = 0
 
+        # Счётчики для статистики ведутся всегда, история по тикам — по желанию
+        self.ticks = 0
+        self.arrived = 0
+        self.busy_ticks = 0
+        self.queue_area = 0
+        self.record_history = record_history
+        if record_history:
+            self.time_points = np.zeros(full_time, dtype=np.int64)
+            self.processor_states = np.zeros((num_processors, full_time), dtype=np.int8)  # ProcessorState.value
+            self.requests_in_queue = np.zeros(full_time, dtype=np.int32)
+            self.requests_completed = np.zeros(full_time, dtype=np.int64)
+            self.requests_rejected = np.zeros(full_time, dtype=np.int64)
+
     def generate_request(self):
         request_time = random.randint(1, self.max_treatment_time)
         return Request(request_time)
 
     def step(self, tik):
+        record = self.record_history and self.ticks < self.full_time
         for i, processor in enumerate(self.processors):
             processor.process()
             if processor.state == ProcessorState.COMPLETE:
                 completed_request = processor.complete_request()
                 if completed_request:
                     self.completed_requests.append(completed_request)
-            self.processor_states[i].append(processor.state)
+            elif processor.state == ProcessorState.BUSY:
+                self.busy_ticks += 1
+            if record:
+                self.processor_states[i, self.ticks] = processor.state.value
 
         for processor in self.processors:
             if processor.state == ProcessorState.IDLE and self.queue:
-                processor.add_request(self.queue.pop(0))
-
-        for request in self.queue:
-            request.waiting_time += 1
+                request = self.queue.popleft()
+                # Время ожидания считается по отметке поступления
+                request.waiting_time = tik - request.arrival_time - 1
+                processor.add_request(request)
 
         if self.time_to_next_request == 0:
             new_request = self.generate_request()
+            new_request.arrival_time = tik
+            self.arrived += 1
             if len(self.queue) < self.max_queue_length:
                 self.queue.append(new_request)
             else:
@@ -94,69 +117,293 @@ class FSMSystem:
         else:
             self.time_to_next_request -= 1
 
-        self.time_points.append(tik)
-        self.requests_in_queue.append(len(self.queue))
-        self.requests_completed.append(len(self.completed_requests))
-        self.requests_rejected.append(len(self.rejected_requests))
+        self.queue_area += len(self.queue)
+        if record:
+            self.time_points[self.ticks] = tik
+            self.requests_in_queue[self.ticks] = len(self.queue)
+            self.requests_completed[self.ticks] = len(self.completed_requests)
+            self.requests_rejected[self.ticks] = len(self.rejected_requests)
+        self.ticks += 1
+
+    def run(self):
+        # Прогон без анимации
+        for tik in range(self.full_time):
+            self.step(tik)
+        return self.statistics()
+
+    def statistics(self):
+        ticks = self.ticks
+        waiting = [request.waiting_time for request in self.completed_requests]
+        return {
+            'arrived': self.arrived,
+            'completed': len(self.completed_requests),
+            'rejected': len(self.rejected_requests),
+            'mean_waiting_time': sum(waiting) / len(waiting) if waiting else 0.0,
+            'mean_queue_length': self.queue_area / ticks if ticks else 0.0,
+            'utilisation': self.busy_ticks / (ticks * self.num_processors) if ticks else 0.0,
+        }
 
     def animate_system(self):
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis('off')
-
-    queue_rect = patches.Rectangle((0.1, 0.8), 0.2, 0.1, edgecolor='black', facecolor='lightblue')
-    ax.add_patch(queue_rect)
-    ax.text(0.2, 0.85, 'Queue', ha='center', fontsize=12)
-
-    # Создаем два круга для каждого процессора: один для состояния IDLE, второй для состояния BUSY
-    idle_circles = []
-    busy_circles = []
-    for i in range(self.num_processors):
-        idle_circle = patches.Circle((0.5 + i * 0.2, 0.6), 0.08, edgecolor='black', facecolor='green', alpha=0.5)
-        busy_circle = patches.Circle((0.5 + i * 0.2, 0.4), 0.08, edgecolor='black', facecolor='red', alpha=0.5)
-        ax.add_patch(idle_circle)
-        ax.add_patch(busy_circle)
-        idle_circles.append(idle_circle)
-        busy_circles.append(busy_circle)
-        ax.text(0.5 + i * 0.2, 0.7, f'Processor {i+1}', ha='center', fontsize=10)
-
-    def update(frame):
-        while ax.texts:
-            ax.texts[-1].remove()
-
-        self.step(frame)
-
-        # Отображаем количество заявок в очереди
-        ax.text(0.2, 0.85, f'Queue: {len(self.queue)}', ha='center', fontsize=12)
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis('off')
+
+        queue_rect = patches.Rectangle((0.1, 0.8), 0.2, 0.1, edgecolor='black', facecolor='lightblue')
+        ax.add_patch(queue_rect)
+        ax.text(0.2, 0.85, 'Queue', ha='center', fontsize=12)
+
+        # Создаем два круга для каждого процессора: один для состояния IDLE, второй для состояния BUSY
+        idle_circles = []
+        busy_circles = []
+        for i in range(self.num_processors):
+            idle_circle = patches.Circle((0.5 + i * 0.2, 0.6), 0.08, edgecolor='black', facecolor='green', alpha=0.5)
+            busy_circle = patches.Circle((0.5 + i * 0.2, 0.4), 0.08, edgecolor='black', facecolor='red', alpha=0.5)
+            ax.add_patch(idle_circle)
+            ax.add_patch(busy_circle)
+            idle_circles.append(idle_circle)
+            busy_circles.append(busy_circle)
+            ax.text(0.5 + i * 0.2, 0.7, f'Processor {i+1}', ha='center', fontsize=10)
+
+        def update(frame):
+            while ax.texts:
+                ax.texts[-1].remove()
+
+            self.step(frame)
+
+            # Отображаем количество заявок в очереди
+            ax.text(0.2, 0.85, f'Queue: {len(self.queue)}', ha='center', fontsize=12)
         
-        # Обновляем состояние каждого процессора
-        for i, processor in enumerate(self.processors):
-            if processor.state == ProcessorState.IDLE:
-                idle_circles[i].set_alpha(1.0)  # IDLE круг загорается
-                busy_circles[i].set_alpha(0.1)  # BUSY круг гаснет
-            elif processor.state == ProcessorState.BUSY:
-                idle_circles[i].set_alpha(0.1)  # IDLE круг гаснет
-                busy_circles[i].set_alpha(1.0)  # BUSY круг загорается
-            else:  # ProcessorState.COMPLETE
-                idle_circles[i].set_alpha(0.1)  # Оба круга гаснут
-                busy_circles[i].set_alpha(0.1)
-
-        # Отображаем количество завершенных и отброшенных заявок
-        ax.text(0.2, 0.1, f'Completed: {len(self.completed_requests)}', ha='center', fontsize=12)
-        ax.text(0.7, 0.1, f'Rejected: {len(self.rejected_requests)}', ha='center', fontsize=12)
-
-    ani = FuncAnimation(fig, update, frames=range(self.full_time), repeat=False)
-    plt.show()
-
-# Запуск системы с анимацией
-fsm_system = FSMSystem(
-    num_processors=2,
-    max_queue_length=10,
-    max_treatment_time=20,
-    full_time=1000,
-    my_lambda=2,
-    tiks_per_second=10
-)
-fsm_system.animate_system()
+            # Обновляем состояние каждого процессора
+            for i, processor in enumerate(self.processors):
+                if processor.state == ProcessorState.IDLE:
+                    idle_circles[i].set_alpha(1.0)  # IDLE круг загорается
+                    busy_circles[i].set_alpha(0.1)  # BUSY круг гаснет
+                elif processor.state == ProcessorState.BUSY:
+                    idle_circles[i].set_alpha(0.1)  # IDLE круг гаснет
+                    busy_circles[i].set_alpha(1.0)  # BUSY круг загорается
+                else:  # ProcessorState.COMPLETE
+                    idle_circles[i].set_alpha(0.1)  # Оба круга гаснут
+                    busy_circles[i].set_alpha(0.1)
+
+            # Отображаем количество завершенных и отброшенных заявок
+            ax.text(0.2, 0.1, f'Completed: {len(self.completed_requests)}', ha='center', fontsize=12)
+            ax.text(0.7, 0.1, f'Rejected: {len(self.rejected_requests)}', ha='center', fontsize=12)
+
+        ani = FuncAnimation(fig, update, frames=range(self.full_time), repeat=False)
+        plt.show()
+
+# Виды событий; при равном времени завершения обрабатываются раньше постановки на процессор
+COMPLETION, DISPATCH, ARRIVAL = range(3)
+
+
+class EventFSMSystem:
+    """
+    Та же СМО, что и FSMSystem, но время идёт скачками от события к событию
+    (поступление заявки, окончание обслуживания), а не по одному тику.
+    Порядок обработки внутри тика и вызовы random совпадают с FSMSystem.step,
+    поэтому при одинаковом seed статистика получается такой же.
+    """
+
+    def __init__(self, num_processors, max_queue_length, max_treatment_time, full_time, my_lambda, tiks_per_second):
+        self.num_processors = num_processors
+        self.max_queue_length = max_queue_length
+        self.max_treatment_time = max_treatment_time
+        self.full_time = full_time
+        self.lambda_ = my_lambda
+        self.tiks_per_second = tiks_per_second
+
+        self.events = [(0, ARRIVAL, 0, 0)]  # (тик, вид, процессор, время ожидания)
+        self.queue = deque()  # (тик поступления, время обслуживания)
+        self.idle_processors = list(range(num_processors))
+        self.arrived = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_waiting_time = 0
+        self.busy_ticks = 0
+        self.queue_area = 0
+        self.last_tick = 0
+
+    def dispatch(self, tik):
+        while self.idle_processors and self.queue:
+            processor = heapq.heappop(self.idle_processors)
+            arrival_tik, treatment_time = self.queue.popleft()
+            waiting_time = tik - arrival_tik - 1
+            # Состояние BUSY фиксируется со следующего тика до тика перед окончанием
+            self.busy_ticks += min(tik + treatment_time, self.full_time) - tik - 1
+            heapq.heappush(self.events, (tik + treatment_time, COMPLETION, processor, waiting_time))
+
+    def run(self):
+        while self.events and self.events[0][0] < self.full_time:
+            tik = self.events[0][0]
+            self.queue_area += len(self.queue) * (tik - self.last_tick)
+            self.last_tick = tik
+
+            arrival = False
+            while self.events and self.events[0][0] == tik:
+                _, kind, processor, waiting_time = heapq.heappop(self.events)
+                if kind == COMPLETION:
+                    self.completed += 1
+                    self.total_waiting_time += waiting_time
+                    heapq.heappush(self.idle_processors, processor)
+                elif kind == ARRIVAL:
+                    arrival = True
+
+            self.dispatch(tik)
+
+            if arrival:
+                self.arrived += 1
+                treatment_time = random.randint(1, self.max_treatment_time)
+                if len(self.queue) < self.max_queue_length:
+                    self.queue.append((tik, treatment_time))
+                    if self.idle_processors:
+                        heapq.heappush(self.events, (tik + 1, DISPATCH, 0, 0))
+                else:
+                    self.rejected += 1
+                gap = int(random.expovariate(self.lambda_) * self.tiks_per_second)
+                heapq.heappush(self.events, (tik + gap + 1, ARRIVAL, 0, 0))
+
+        self.queue_area += len(self.queue) * (self.full_time - self.last_tick)
+        self.last_tick = self.full_time
+        return self.statistics()
+
+    def statistics(self):
+        ticks = self.full_time
+        return {
+            'arrived': self.arrived,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'mean_waiting_time': self.total_waiting_time / self.completed if self.completed else 0.0,
+            'mean_queue_length': self.queue_area / ticks if ticks else 0.0,
+            'utilisation': self.busy_ticks / (ticks * self.num_processors) if ticks else 0.0,
+        }
+
+
+def _run_replication(seed, engine, params):
+    random.seed(seed)
+    if engine == 'event':
+        system = EventFSMSystem(**params)
+    else:
+        system = FSMSystem(**params, record_history=False)
+    result = system.run()
+    result['rejection_probability'] = result['rejected'] / result['arrived'] if result['arrived'] else 0.0
+    return result
+
+
+def run_replications(replications, seed=0, workers=None, engine='event', confidence=0.95, **params):
+    """
+    Прогоняет replications независимых повторов СМО без анимации
+    (каждый со своим seed) в пуле процессов и возвращает сводную статистику.
+    engine: 'event' (EventFSMSystem) или 'tick' (FSMSystem).
+    params: Параметры FSMSystem (num_processors, max_queue_length, ...).
+    """
+    seeds = range(seed, seed + replications)
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, replications // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_run_replication, seeds, repeat(engine), repeat(params), chunksize=chunksize))
+    return summarize(results, confidence)
+
+
+def validate_replications(replications=200, seed=0, workers=None, tolerance=0.1, **params):
+    """
+    Сравнивает повторы СМО с аналитическим приближением M/G/n/K (analytic.py).
+    Если все метрики в пределах tolerance, дальше можно считать по формулам.
+    """
+    simulated = run_replications(replications, seed, workers, **params)
+    return validate(simulated, fsm_system_metrics(**params), tolerance)
+
+
+def simulate_batch(num_processors, max_queue_length, max_treatment_time, my_lambda, full_time, tiks_per_second,
+                   seed=None):
+    """
+    Векторизованный тиковый прогон множества независимых СМО сразу.
+    Параметры num_processors, max_queue_length, max_treatment_time, my_lambda —
+    числа или массивы одной длины (по системе на элемент).
+    Логика тика та же, что в FSMSystem.step, но случайные величины берутся
+    массивами из numpy.random.Generator, поэтому поток случайных чисел другой.
+    Возвращает словарь массивов с метриками для каждой системы.
+    """
+    rng = np.random.default_rng(seed)
+    num_processors, max_queue_length, max_treatment_time, my_lambda = np.broadcast_arrays(
+        np.asarray(num_processors), np.asarray(max_queue_length),
+        np.asarray(max_treatment_time), np.asarray(my_lambda, dtype=float))
+    num_processors = num_processors.ravel()
+    max_queue_length = max_queue_length.ravel()
+    max_treatment_time = max_treatment_time.ravel()
+    my_lambda = my_lambda.ravel()
+    systems = len(num_processors)
+    rows = np.arange(systems)
+    slots = int(num_processors.max())
+    capacity = max(int(max_queue_length.max()), 1)
+
+    # Оставшееся время обслуживания по процессорам; лишние процессоры помечены -1
+    remaining = np.where(np.arange(slots) < num_processors[:, None], 0, -1)
+    waiting_in_service = np.zeros((systems, slots), dtype=np.int64)
+    # Кольцевой буфер тиков поступления заявок в очереди
+    arrivals = np.zeros((systems, capacity), dtype=np.int64)
+    head = np.zeros(systems, dtype=np.int64)
+    queue_length = np.zeros(systems, dtype=np.int64)
+    time_to_next_request = np.zeros(systems, dtype=np.int64)
+
+    arrived = np.zeros(systems, dtype=np.int64)
+    completed = np.zeros(systems, dtype=np.int64)
+    rejected = np.zeros(systems, dtype=np.int64)
+    total_waiting_time = np.zeros(systems, dtype=np.int64)
+    busy_ticks = np.zeros(systems, dtype=np.int64)
+    queue_area = np.zeros(systems, dtype=np.int64)
+
+    for tik in range(full_time):
+        busy = remaining > 0
+        remaining[busy] -= 1
+        done = busy & (remaining == 0)
+        completed += done.sum(axis=1)
+        total_waiting_time += (waiting_in_service * done).sum(axis=1)
+        busy_ticks += (remaining > 0).sum(axis=1)
+
+        for slot in range(slots):
+            take = (remaining[:, slot] == 0) & (queue_length > 0)
+            if not take.any():
+                continue
+            index = rows[take]
+            waiting_in_service[index, slot] = tik - arrivals[index, head[index]] - 1
+            remaining[index, slot] = rng.integers(1, max_treatment_time[index] + 1)
+            head[index] = (head[index] + 1) % capacity
+            queue_length[index] -= 1
+
+        arrive = time_to_next_request == 0
+        accept = arrive & (queue_length < max_queue_length)
+        index = rows[accept]
+        arrivals[index, (head[index] + queue_length[index]) % capacity] = tik
+        queue_length[index] += 1
+        arrived += arrive
+        rejected += arrive & ~accept
+        gaps = (rng.standard_exponential(systems) / my_lambda * tiks_per_second).astype(np.int64)
+        time_to_next_request = np.where(arrive, gaps, time_to_next_request - 1)
+
+        queue_area += queue_length
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'arrived': arrived,
+            'completed': completed,
+            'rejected': rejected,
+            'rejection_probability': np.where(arrived > 0, rejected / np.maximum(arrived, 1), 0.0),
+            'mean_waiting_time': np.where(completed > 0, total_waiting_time / np.maximum(completed, 1), 0.0),
+            'mean_queue_length': queue_area / full_time if full_time else np.zeros(systems),
+            'utilisation': busy_ticks / (full_time * num_processors) if full_time else np.zeros(systems),
+        }
+
+
+if __name__ == "__main__":
+    # Запуск системы с анимацией
+    fsm_system = FSMSystem(
+        num_processors=2,
+        max_queue_length=10,
+        max_treatment_time=20,
+        full_time=1000,
+        my_lambda=2,
+        tiks_per_second=10
+    )
+    fsm_system.animate_system()
@@ -0,0 +1,355 @@
+from array import array
+from collections import deque
+import numpy as np
+from smo_petri import PetriNet
+
+# Маркер ω в разметке покрывающего графа (неограниченное число токенов)
+OMEGA = np.iinfo(np.int32).max
+
+# Ограничение памяти на граф по умолчанию (в байтах)
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+
+# Примерные накладные расходы Python на одно состояние (ключ словаря, запись в списке)
+# и на одну дугу графа (три элемента array('i') плюс запас)
+STATE_OVERHEAD = 150
+EDGE_OVERHEAD = 16
+
+
+class ReachabilityGraph:
+    """
+    Граф достижимости (покрывающий граф Карпа—Миллера для неограниченных сетей).
+    Разметки хранятся компактно — байтами int32 — и служат ключами хеш-таблицы.
+    Дуги хранятся в трёх массивах array('i') (откуда, переход, куда),
+    упорядоченных по исходному состоянию; offsets[s] — начало дуг состояния s.
+    Состояния раскрываются в порядке номеров: первые expanded состояний имеют
+    все свои дуги, остальные (при неполном обходе) не раскрыты.
+    """
+
+    def __init__(self, net):
+        self.net = net
+        self.keys = []
+        self.index = {}
+        self.parents = array('i')
+        self.sources = array('i')
+        self.labels = array('i')
+        self.targets = array('i')
+        self.offsets = array('i')
+        self.expanded = 0
+        self.complete = True
+        self.reduced = False
+        self.has_omega = False
+
+    def __len__(self):
+        return len(self.keys)
+
+    def marking(self, state):
+        return np.frombuffer(self.keys[state], dtype=np.int32)
+
+    def marking_dict(self, state):
+        # Только непустые места; ω записывается строкой
+        names = list(self.net.place_index)
+        return {names[p]: ('ω' if tokens == OMEGA else int(tokens))
+                for p, tokens in enumerate(self.marking(state)) if tokens}
+
+    def successors(self, state):
+        start = self.offsets[state]
+        end = self.offsets[state + 1] if state + 1 < len(self.offsets) else len(self.targets)
+        return zip(self.labels[start:end], self.targets[start:end])
+
+    def _add(self, key, parent):
+        state = self.index.get(key)
+        if state is None:
+            state = len(self.keys)
+            self.index[key] = state
+            self.keys.append(key)
+            self.parents.append(parent)
+        return state
+
+
+def _conflicts_and_producers(net):
+    # Для стабильных (stubborn) множеств: переходы, делящие входное место,
+    # и переходы, увеличивающие число токенов в месте
+    pre, post = net.pre, net.post
+    consumers = [np.flatnonzero(pre[:, p]) for p in range(pre.shape[1])]
+    conflicts = [set(np.concatenate([consumers[p] for p in np.flatnonzero(pre[t])] or [[]]).astype(int))
+                 for t in range(pre.shape[0])]
+    producers = [np.flatnonzero(post[:, p] > pre[:, p]).tolist() for p in range(pre.shape[1])]
+    return conflicts, producers
+
+
+def _stubborn(enabled, marking, pre, conflicts, producers):
+    """
+    Стабильное множество (Валмари), сохраняющее все тупики: для разрешённого
+    перехода в множество входят все конкурирующие за его входные места, для
+    запрещённого — все переходы, пополняющие одно из недостающих мест.
+    Перебираются все стартовые переходы, выбирается множество с наименьшим
+    числом разрешённых переходов.
+    """
+    best = None
+    for seed in np.flatnonzero(enabled):
+        stubborn = {int(seed)}
+        stack = [int(seed)]
+        while stack:
+            t = stack.pop()
+            if enabled[t]:
+                following = conflicts[t]
+            else:
+                lacking = np.flatnonzero(marking < pre[t])[0]
+                following = producers[lacking]
+            for u in following:
+                if u not in stubborn:
+                    stubborn.add(u)
+                    stack.append(u)
+        chosen = [t for t in stubborn if enabled[t]]
+        if best is None or len(chosen) < len(best):
+            best = chosen
+            if len(best) == 1:
+                break
+    return sorted(best)
+
+
+def build_reachability_graph(net, reduce=False, memory_limit=DEFAULT_MEMORY_LIMIT):
+    """
+    Строит граф достижимости обходом в ширину с ускорением Карпа—Миллера:
+    если новая разметка строго покрывает разметку предка, растущие места получают ω.
+
+    net: PetriNet из smo_petri.
+    reduce: Частично-порядковая редукция (стабильные множества). Сохраняет тупики,
+        но не ограниченность и живость.
+    memory_limit: Примерный предел памяти под граф; при его достижении обход
+        прекращается и graph.complete = False.
+    """
+    graph = ReachabilityGraph(net)
+    graph.reduced = reduce
+    pre = net.pre.astype(np.int64)
+    incidence = net.incidence.astype(np.int64)
+    if reduce:
+        conflicts, producers = _conflicts_and_producers(net)
+    key_size = len(net.place_index) * 4
+
+    graph._add(net.marking.astype(np.int32).tobytes(), -1)
+    frontier = deque([0])
+    while frontier:
+        state = frontier.popleft()
+        while len(graph.offsets) <= state:
+            graph.offsets.append(len(graph.targets))
+        marking = graph.marking(state).astype(np.int64)
+        enabled = net.enabled(marking)
+        transitions = np.flatnonzero(enabled)
+        if reduce and len(transitions) > 1:
+            transitions = _stubborn(enabled, marking, pre, conflicts, producers)
+        if not len(transitions):
+            continue
+
+        # Разметки предков в дереве обхода — одной матрицей на все потомки
+        chain = []
+        ancestor = state
+        while ancestor >= 0:
+            chain.append(graph.keys[ancestor])
+            ancestor = graph.parents[ancestor]
+        ancestors = np.frombuffer(b''.join(chain), dtype=np.int32).reshape(len(chain), -1)
+
+        omega = marking == OMEGA
+        for t in transitions:
+            successor = marking + incidence[t]
+            successor[omega] = OMEGA
+            while True:
+                covered = np.all(successor >= ancestors, axis=1) & np.any(successor > ancestors, axis=1)
+                growing = np.any(successor > ancestors[covered], axis=0) & (successor != OMEGA)
+                if not growing.any():
+                    break
+                successor[growing] = OMEGA
+                graph.has_omega = True
+
+            known = len(graph.keys)
+            target = graph._add(successor.astype(np.int32).tobytes(), state)
+            if target == known:
+                frontier.append(target)
+            graph.sources.append(state)
+            graph.labels.append(int(t))
+            graph.targets.append(target)
+
+        used = len(graph.keys) * (key_size + STATE_OVERHEAD) + len(graph.targets) * EDGE_OVERHEAD
+        if used > memory_limit:
+            graph.complete = False
+            break
+
+    graph.expanded = len(graph.offsets)
+    while len(graph.offsets) < len(graph.keys):
+        graph.offsets.append(len(graph.targets))
+    return graph
+
+
+def _bottom_components(graph):
+    # Итеративный алгоритм Тарьяна; возвращает множества состояний терминальных компонент
+    n = len(graph)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    component = [-1] * n
+    stack = []
+    components = []
+    counter = 0
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        work = [(root, iter(graph.successors(root)))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while work:
+            state, edges = work[-1]
+            advanced = False
+            for _, target in edges:
+                if index[target] < 0:
+                    index[target] = low[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack[target] = True
+                    work.append((target, iter(graph.successors(target))))
+                    advanced = True
+                    break
+                if on_stack[target]:
+                    low[state] = min(low[state], index[target])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[state])
+            if low[state] == index[state]:
+                members = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component[member] = len(components)
+                    members.append(member)
+                    if member == state:
+                        break
+                components.append(members)
+
+    bottom = [True] * len(components)
+    for source, target in zip(graph.sources, graph.targets):
+        if component[source] != component[target]:
+            bottom[component[source]] = False
+    return [members for members, is_bottom in zip(components, bottom) if is_bottom], component
+
+
+def analyse(net, reduce=False, memory_limit=DEFAULT_MEMORY_LIMIT, examples=5):
+    """
+    Структурный анализ сети по графу достижимости.
+    Возвращает словарь:
+        states, edges, complete, reduced — размер и полнота графа;
+        bounded — ограниченность (None, если по неполному или редуцированному графу не определить);
+        bounds — максимальное число токенов в каждом месте ('ω' для неограниченных);
+        bounds_exact — False, если граф неполный или редуцированный: тогда bounds —
+            только нижние оценки;
+        deadlocks, deadlock_examples — число тупиковых разметок и несколько примеров;
+        deadlocks_exact — False, если граф неполный: тогда учтены лишь тупики среди
+            раскрытых состояний, и deadlocks — нижняя оценка;
+        dead_transitions — переходы, которые никогда не срабатывают (только для полного графа);
+        live — живые переходы (срабатывают из любой достижимой разметки);
+            None, если граф неполный, редуцированный или содержит ω.
+    """
+    graph = build_reachability_graph(net, reduce, memory_limit)
+    names = list(net.transition_index)
+    exact = graph.complete and not reduce
+
+    markings = np.frombuffer(b''.join(graph.keys), dtype=np.int32).reshape(len(graph), -1)
+    maxima = markings.max(axis=0)
+    bounds = {place: ('ω' if maxima[p] == OMEGA else int(maxima[p])) for place, p in net.place_index.items()}
+
+    offsets = list(graph.offsets) + [len(graph.targets)]
+    # Нераскрытые состояния неполного графа не имеют дуг, но тупиками от этого не являются
+    deadlocks = [state for state in range(graph.expanded) if offsets[state] == offsets[state + 1]]
+
+    report = {
+        'states': len(graph),
+        'edges': len(graph.targets),
+        'complete': graph.complete,
+        'reduced': reduce,
+        'bounded': False if graph.has_omega else (True if exact else None),
+        'bounds': bounds,
+        'bounds_exact': exact,
+        'deadlocks': len(deadlocks),
+        'deadlocks_exact': graph.complete,
+        'deadlock_examples': [graph.marking_dict(state) for state in deadlocks[:examples]],
+        'dead_transitions': None,
+        'live': None,
+    }
+    if exact:
+        fired = set(graph.labels)
+        report['dead_transitions'] = [name for t, name in enumerate(names) if t not in fired]
+    if exact and not graph.has_omega:
+        # Переход живой, если он помечает дугу внутри каждой терминальной компоненты
+        bottom, component = _bottom_components(graph)
+        live = set(range(len(names)))
+        for members in bottom:
+            inside = {label for source, label, target in zip(graph.sources, graph.labels, graph.targets)
+                      if component[source] == component[members[0]] and component[target] == component[source]}
+            live &= inside
+        report['live'] = [names[t] for t in sorted(live)]
+    return report
+
+
+def smo_net(num_processors=2, max_queue_length=None):
+    """
+    Нетаймированная модель СМО из run_smo: заявки поступают в очередь, свободный
+    процессор забирает заявку, обработка завершается в произвольный момент.
+    max_queue_length: Ёмкость очереди (место slots); None — неограниченная очередь.
+    """
+    net = PetriNet()
+    net.add_place('queue', 0)
+    if max_queue_length is not None:
+        net.add_place('slots', max_queue_length)
+    for i in range(1, num_processors + 1):
+        net.add_place(f'processor{i}', 0)
+        net.add_place(f'idle{i}', 1)
+    net.add_place('completed', 0)
+
+    slots = [] if max_queue_length is None else ['slots']
+    net.add_transition('arrive', slots, ['queue'])
+    for i in range(1, num_processors + 1):
+        net.add_transition(f'start{i}', ['queue', f'idle{i}'], [f'processor{i}'] + slots)
+        net.add_transition(f'process{i}', [f'processor{i}'], ['completed', f'idle{i}'])
+    return net
+
+
+def philosophers_net(n=5, atomic=True):
+    """
+    Обедающие мудрецы из netpetri как сеть мест и переходов.
+    atomic: Мудрец берёт обе палочки сразу (как в netpetri); иначе сначала левую,
+        затем правую, и сеть может зайти в тупик.
+    """
+    net = PetriNet()
+    for i in range(1, n + 1):
+        net.add_place(f'P{i}_thinking', 1)
+        if not atomic:
+            net.add_place(f'P{i}_left', 0)
+        net.add_place(f'P{i}_eating', 0)
+        net.add_place(f'C{i}', 1)
+    for i in range(1, n + 1):
+        left, right = f'C{i}', f'C{i % n + 1}'
+        if atomic:
+            net.add_transition(f'P{i}_take', [f'P{i}_thinking', left, right], [f'P{i}_eating'])
+        else:
+            net.add_transition(f'P{i}_take_left', [f'P{i}_thinking', left], [f'P{i}_left'])
+            net.add_transition(f'P{i}_take_right', [f'P{i}_left', right], [f'P{i}_eating'])
+        net.add_transition(f'P{i}_release', [f'P{i}_eating'], [f'P{i}_thinking', left, right])
+    return net
+
+
+if __name__ == "__main__":
+    for title, net, reduce in [
+        ("СМО, 2 процессора, очередь 3", smo_net(2, 3), False),
+        ("СМО, 23 процессора, очередь 10 (49 мест)", smo_net(23, 10), True),
+        ("Мудрецы, 5, обе палочки сразу", philosophers_net(5), False),
+        ("Мудрецы, 5, по одной палочке", philosophers_net(5, atomic=False), False),
+        ("Мудрецы, 17, по одной палочке (68 мест)", philosophers_net(17, atomic=False), True),
+    ]:
+        report = analyse(net, reduce=reduce)
+        print(title)
+        for key in ('states', 'edges', 'complete', 'bounded', 'deadlocks', 'deadlock_examples',
+                    'dead_transitions', 'live'):
+            print(f"    {key}: {report[key]}")
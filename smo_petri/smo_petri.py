@@ -1,8 +1,17 @@
 import math
+import os
 import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.animation import FuncAnimation
 
+# Сводная статистика повторов и аналитические формулы общие с моделью СМО (smo/analytic.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'smo'))
+from analytic import petri_metrics, summarize, validate
+
 # Генератор экспоненциального распределения
 class ExponGenerator:
     def __init__(self, lmbd, tiks_per_second):
@@ -15,153 +24,277 @@ class ExponGenerator:
         self.time_to_next_request = math.log(1 - uniform_random_value) * (-1 / self.lmbd)
         self.time_to_next_request = round(self.time_to_next_request * self.tiks_per_second)
 
-# Класс для мест сети Петри
-class Place:
-    def __init__(self, name, tokens=0):
-        self.name = name
-        self.tokens = tokens
-
-    def add_tokens(self, count=1):
-        self.tokens += count
-
-    def remove_tokens(self, count=1):
-        if self.tokens >= count:
-            self.tokens -= count
-
-# Класс для переходов сети Петри
-class Transition:
-    def __init__(self, name, input_places, output_places):
-        self.name = name
-        self.input_places = input_places
-        self.output_places = output_places
-
-    def can_fire(self):
-        return all(place.tokens > 0 for place in self.input_places)
-
-    def fire(self):
-        if self.can_fire():
-            for place in self.input_places:
-                place.remove_tokens()
-            for place in self.output_places:
-                place.add_tokens()
-
-# Класс для управления сетью Петри
+# Сеть Петри в матричной форме: разметка — вектор токенов,
+# переходы — матрицы инцидентности pre (сколько забирают) и post (сколько кладут)
 class PetriNet:
     def __init__(self):
-        self.places = {}
-        self.transitions = {}
+        self.place_index = {}
+        self.transition_index = {}
+        self.marking = np.zeros(0, dtype=np.int64)
+        self._arcs = []
+        self._pre = None
+        self._post = None
 
     def add_place(self, name, tokens=0):
-        self.places[name] = Place(name, tokens)
+        self.place_index[name] = len(self.place_index)
+        self.marking = np.append(self.marking, tokens)
+        self._pre = None
 
     def add_transition(self, name, input_places, output_places):
-        self.transitions[name] = Transition(
-            name,
-            [self.places[ip] for ip in input_places],
-            [self.places[op] for op in output_places]
-        )
+        self.transition_index[name] = len(self.transition_index)
+        self._arcs.append((
+            [self.place_index[ip] for ip in input_places],
+            [self.place_index[op] for op in output_places]
+        ))
+        self._pre = None
+
+    def _build(self):
+        shape = (len(self.transition_index), len(self.place_index))
+        self._pre = np.zeros(shape, dtype=np.int64)
+        self._post = np.zeros(shape, dtype=np.int64)
+        for t, (inputs, outputs) in enumerate(self._arcs):
+            np.add.at(self._pre[t], inputs, 1)
+            np.add.at(self._post[t], outputs, 1)
+        # Ненулевые элементы матриц (дуги), упорядоченные по номеру перехода:
+        # сеть разреженная, и проверки по дугам не зависят от размера T x P
+        self._inputs = self._arc_arrays(self._pre)
+        self._outputs = self._arc_arrays(self._post)
+
+    @staticmethod
+    def _arc_arrays(matrix):
+        transitions, places = np.nonzero(matrix)
+        return transitions, places, matrix[transitions, places]
+
+    @property
+    def pre(self):
+        if self._pre is None:
+            self._build()
+        return self._pre
+
+    @property
+    def post(self):
+        if self._pre is None:
+            self._build()
+        return self._post
+
+    @property
+    def incidence(self):
+        return self.post - self.pre
+
+    def tokens(self, name):
+        return int(self.marking[self.place_index[name]])
+
+    def add_tokens(self, name, count=1):
+        self.marking[self.place_index[name]] += count
+
+    def enabled(self, marking=None):
+        # Все разрешённые переходы одним сравнением: marking >= pre по всем дугам
+        if self._pre is None:
+            self._build()
+        marking = self.marking if marking is None else marking
+        transitions, places, weights = self._inputs
+        lacking = transitions[marking[places] < weights]
+        return np.bincount(lacking, minlength=len(self.transition_index)) == 0
+
+    def fire(self, mask=None):
+        """
+        Срабатывание пакета переходов за один шаг.
+        mask: Булев вектор переходов-кандидатов (по умолчанию все разрешённые).
+        Конфликты за токены решаются приоритетом: переходы срабатывают так, как если бы
+        они забирали токены по очереди в порядке индексов, и переход, которому не
+        хватило оставшихся токенов, пропускается.
+        Возвращает маску сработавших переходов.
+        """
+        fired = self.enabled() if mask is None else mask & self.enabled()
+        transitions, places, weights = self._inputs
+        while True:
+            selected = fired[transitions]
+            lacking = self._lacking(transitions[selected], places[selected], weights[selected])
+            if not len(lacking):
+                break
+            # Переходы с меньшим индексом, чем первый нехватающий, сработают при любом исходе;
+            # всё, чему не хватает токенов после них, точно пропускается
+            first = lacking.min()
+            certain = selected & (transitions < first)
+            available = self.marking - np.bincount(places[certain], weights[certain], len(self.marking))
+            blocked = selected & (transitions >= first) & (weights > available[places])
+            fired[transitions[blocked]] = False
+
+        # Пакетное изменение разметки: -pre и +post сработавших переходов
+        size = len(self.marking)
+        for (arc_transitions, arc_places, arc_weights), sign in ((self._inputs, -1), (self._outputs, 1)):
+            active = fired[arc_transitions]
+            self.marking += sign * np.bincount(arc_places[active], arc_weights[active], size).astype(np.int64)
+        return fired
+
+    def _lacking(self, transitions, places, weights):
+        # Накопленный спрос на каждое место в порядке приоритета переходов
+        order = np.lexsort((transitions, places))
+        places, weights = places[order], weights[order]
+        total = np.cumsum(weights)
+        first = np.ones(len(places), dtype=bool)
+        first[1:] = places[1:] != places[:-1]
+        demand = total - (total - weights)[first][np.cumsum(first) - 1]
+        return transitions[order][demand > self.marking[places]]
 
     def run_transition(self, name):
-        if name in self.transitions and self.transitions[name].can_fire():
-            self.transitions[name].fire()
+        mask = np.zeros(len(self.transition_index), dtype=bool)
+        mask[self.transition_index[name]] = True
+        return bool(self.fire(mask).any())
 
-# Основная функция симуляции СМО
-def simulate_smo(num_processors=2, full_time=3000, max_treatment_time=100, my_lambda=5.0, max_queue_length=50):
+# Прогон сети Петри без анимации; возвращает историю токенов по тикам
+def run_smo(num_processors=2, full_time=3000, max_treatment_time=100, my_lambda=5.0, max_queue_length=50):
     tiks_per_second = 50
     generator = ExponGenerator(my_lambda, tiks_per_second)
+    processors = [f'processor{i}' for i in range(1, num_processors + 1)]
 
-    # Инициализация сети Петри
+    # Инициализация сети Петри: для каждого процессора места «занят», «свободен»
+    # и «обслуживание закончено» (токен кладёт таймер)
     petri_net = PetriNet()
     petri_net.add_place('queue', 0)
-    petri_net.add_place('processor1', 0)
-    petri_net.add_place('processor2', 0)
+    for i, processor in enumerate(processors, 1):
+        petri_net.add_place(processor, 0)
+        petri_net.add_place(f'idle{i}', 1)
+        petri_net.add_place(f'done{i}', 0)
     petri_net.add_place('completed', 0)
     petri_net.add_place('rejected', 0)
 
-    # Переходы сети Петри
-    petri_net.add_transition('enqueue', ['queue'], ['processor1', 'processor2'])
-    petri_net.add_transition('process1', ['processor1'], ['completed'])
-    petri_net.add_transition('process2', ['processor2'], ['completed'])
+    # Переходы сети Петри: подача заявки в процессор и завершение обработки
+    for i, processor in enumerate(processors, 1):
+        petri_net.add_transition(f'start{i}', ['queue', f'idle{i}'], [processor])
+    for i, processor in enumerate(processors, 1):
+        petri_net.add_transition(f'process{i}', [processor, f'done{i}'], ['completed', f'idle{i}'])
+
+    index = petri_net.place_index
+    queue, rejected = index['queue'], index['rejected']
+    processor_places = np.array([index[name] for name in processors])
+    done_places = np.array([index[f'done{i}'] for i in range(1, num_processors + 1)])
+    starts = np.zeros(2 * num_processors, dtype=bool)
+    starts[:num_processors] = True
+    finishes = ~starts
 
-    # История токенов для визуализации
-    history = {name: [] for name in petri_net.places}
-    treatment_times = {name: 0 for name in ['processor1', 'processor2']}
+    # История токенов для визуализации (только места исходной модели)
+    names = ['queue'] + processors + ['completed', 'rejected']
+    recorded = np.array([index[name] for name in names])
+    tokens = np.empty((full_time, len(names)), dtype=np.int64)
+    treatment_times = np.zeros(num_processors, dtype=np.int64)
 
     # Основной цикл симуляции
     for tik in range(full_time):
+        marking = petri_net.marking
         # Генерация новой заявки
         if generator.time_to_next_request == 0:
             generator.generate()
-            if petri_net.places['queue'].tokens < max_queue_length:
-                petri_net.places['queue'].add_tokens()
+            if marking[queue] < max_queue_length:
+                marking[queue] += 1
             else:
-                petri_net.places['rejected'].add_tokens()
+                marking[rejected] += 1
         else:
             generator.time_to_next_request -= 1
 
-        # Подача заявки в процессор 1
-        if petri_net.places['processor1'].tokens == 0 and petri_net.places['queue'].tokens > 0:
-            petri_net.places['processor1'].add_tokens()
-            petri_net.places['queue'].remove_tokens()
-            treatment_times['processor1'] = max_treatment_time
-
-        # Подача заявки в процессор 2
-        if petri_net.places['processor2'].tokens == 0 and petri_net.places['queue'].tokens > 0:
-            petri_net.places['processor2'].add_tokens()
-            petri_net.places['queue'].remove_tokens()
-            treatment_times['processor2'] = max_treatment_time
-
-        # Завершение обработки в процессоре 1
-        if petri_net.places['processor1'].tokens > 0:
-            treatment_times['processor1'] -= 1
-            if treatment_times['processor1'] <= 0:
-                petri_net.run_transition('process1')  # Перемещаем заявку из processor1 в completed
-
-        # Завершение обработки в процессоре 2
-        if petri_net.places['processor2'].tokens > 0:
-            treatment_times['processor2'] -= 1
-            if treatment_times['processor2'] <= 0:
-                petri_net.run_transition('process2')  # Перемещаем заявку из processor2 в completed
+        # Подача заявок в свободные процессоры по порядку номеров
+        started = petri_net.fire(starts)[:num_processors]
+        treatment_times[started] = max_treatment_time
+
+        # Завершение обработки: истёкшие таймеры кладут токен в done
+        busy = petri_net.marking[processor_places] > 0
+        treatment_times[busy] -= 1
+        petri_net.marking[done_places] += busy & (treatment_times <= 0)
+        petri_net.fire(finishes)
 
         # Сохраняем текущее состояние токенов для визуализации
-        for name in history:
-            history[name].append(petri_net.places[name].tokens)
+        tokens[tik] = petri_net.marking[recorded]
+
+    return {name: tokens[:, j] for j, name in enumerate(names)}
 
-    # Настройка графика для анимации
+
+# Основная функция симуляции СМО
+def simulate_smo(num_processors=2, full_time=3000, max_treatment_time=100, my_lambda=5.0, max_queue_length=50):
+    history = run_smo(num_processors, full_time, max_treatment_time, my_lambda, max_queue_length)
+
+    # Настройка графика для анимации: процессоры равномерно по вертикали
     fig, ax = plt.subplots(figsize=(8, 4))
-    positions = {
-        'queue': (-1, 1.5),
-        'processor1': (1.5, 2),
-        'processor2': (1.5, 1),
-        'completed': (4, 1.5),
-        'rejected': (-1, 0.5)
-    }
+    processors = [name for name in history if name.startswith('processor')]
+    step = 3 / len(processors)
+    positions = {'queue': (-1, 1.5), 'completed': (4, 1.5), 'rejected': (-1, 0.5)}
+    for i, name in enumerate(processors):
+        positions[name] = (1.5, 3 - step * (i + 0.5))
+    markersize = min(30, max(3, 300 * step / 3))
+    labelled = len(processors) <= 10
+
+    # Связи между местами
+    connections = [('queue', 'rejected')]
+    for name in processors:
+        connections += [('queue', name), (name, 'completed')]
 
     def update_graph(frame):
         ax.clear()
         ax.set_xlim(-2, 6)
-        ax.set_ylim(-1, 3)
+        ax.set_ylim(-1, 3.5)
 
         for name, pos in positions.items():
-            ax.plot(*pos, 'o', markersize=30, label=name, color="lightblue")
-            ax.text(pos[0], pos[1] + 0.3, f"{name}: {history[name][frame]}", ha='center')
-
-        # Отображение связей между местами
-        connections = [
-            ('queue', 'processor1'),
-            ('queue', 'processor2'),
-            ('processor1', 'completed'),
-            ('processor2', 'completed'),
-            ('queue', 'rejected')
-        ]
+            ax.plot(*pos, 'o', markersize=markersize if name in processors else 30, color="lightblue")
+            if labelled or name not in processors:
+                ax.text(pos[0], pos[1] + 0.3, f"{name}: {history[name][frame]}", ha='center')
+        if not labelled:
+            busy = sum(int(history[name][frame]) for name in processors)
+            ax.text(1.5, 3.2, f"busy: {busy}/{len(processors)}", ha='center')
+
         for start, end in connections:
             ax.plot(
                 [positions[start][0], positions[end][0]],
                 [positions[start][1], positions[end][1]],
-                'k-', lw=1
+                'k-', lw=1 if labelled else 0.2
             )
 
     ani = FuncAnimation(fig, update_graph, frames=len(history['queue']), interval=20, repeat=False)
     plt.show()
 
-simulate_smo(num_processors=2, full_time=3000, max_treatment_time=100, my_lambda=5, max_queue_length=50)
+
+def smo_statistics(history):
+    ticks = len(history['queue'])
+    # Токены сохраняются, поэтому их итоговая сумма равна числу поступивших заявок
+    arrived = int(sum(tokens[-1] for tokens in history.values())) if ticks else 0
+    rejected = int(history['rejected'][-1]) if ticks else 0
+    processors = [name for name in history if name.startswith('processor')]
+    mean_queue_length = float(np.mean(history['queue'])) if ticks else 0.0
+    accepted_rate = (arrived - rejected) / ticks if ticks else 0.0
+    busy = sum(int(np.sum(history[name])) for name in processors)
+    return {
+        'arrived': arrived,
+        'completed': int(history['completed'][-1]) if ticks else 0,
+        'rejected': rejected,
+        'rejection_probability': rejected / arrived if arrived else 0.0,
+        'mean_queue_length': mean_queue_length,
+        'utilisation': busy / (ticks * len(processors)) if ticks else 0.0,
+        # Формула Литтла: время ожидания в тиках
+        'mean_waiting_time': mean_queue_length / accepted_rate if accepted_rate else 0.0,
+    }
+
+
+def _run_replication(seed, params):
+    random.seed(seed)
+    return smo_statistics(run_smo(**params))
+
+
+# Независимые повторы без анимации в пуле процессов
+def run_replications(replications, seed=0, workers=None, confidence=0.95, **params):
+    seeds = range(seed, seed + replications)
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, replications // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_run_replication, seeds, repeat(params), chunksize=chunksize))
+    return summarize(results, confidence)
+
+
+def validate_replications(replications=200, seed=0, workers=None, tolerance=0.1, **params):
+    """
+    Сравнивает повторы run_smo с приближением M/D/n/K (smo/analytic.py).
+    Если все метрики в пределах tolerance, дальше можно считать по формулам.
+    """
+    simulated = run_replications(replications, seed, workers, **params)
+    return validate(simulated, petri_metrics(**params), tolerance)
+
+
+if __name__ == "__main__":
+    simulate_smo(num_processors=2, full_time=3000, max_treatment_time=100, my_lambda=5, max_queue_length=50)
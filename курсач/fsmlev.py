@@ -1,17 +1,147 @@
+import argparse
+import heapq
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
 import requests
-from bisect import bisect_left
 from spellchecker import SpellChecker
 
 spell = SpellChecker(language="ru")  # Инициализация для русского языка
 
+WORD_PATTERN = re.compile(r"[а-яёa-z]+(?:-[а-яёa-z]+)*")
+
+# Меньше этого числа неизвестных слов пул процессов не запускается
+PARALLEL_THRESHOLD = 256
+
+# Максимальное расстояние, для которого строится детерминированная таблица
+MAX_COMPILED_DISTANCE = 3
+
+# Заголовок бинарного словаря: сигнатура, версия, число слов
+BINARY_HEADER = struct.Struct("<4sII")
+BINARY_MAGIC = b"LEVD"
+BINARY_VERSION = 1
+
+# После стольких добавленных слов журнал вливается в основной файл
+DELTA_MERGE_THRESHOLD = 1000
+
+# Сколько результатов проверки хранит кэш
+SUGGESTION_CACHE_SIZE = 10000
+
+# Дерево последнего словаря-списка, переданного в suggest_word: (список, длина, Trie)
+_list_trie = None
+
+
+class ParametricTable:
+    """
+    Универсальный (параметрический) ДКА Левенштейна для заданного max_distance.
+
+    Состояние не зависит от слова: это нормализованный набор позиций (d, e),
+    где d — сдвиг относительно базовой позиции в слове, e — число ошибок.
+    Символ входа кодируется характеристическим вектором: какие из ближайших
+    2 * max_distance + 1 символов слова с ним совпадают. Переходы
+    вычисляются при первом обращении и кэшируются, поэтому таблица общая
+    для всех слов с одинаковым max_distance.
+    """
+
+    _tables = {}
+
+    def __init__(self, max_distance):
+        self.max_distance = max_distance
+        self.window = 2 * max_distance + 1
+        self.row_size = 1 << (self.window + 1)
+        self.states = [(), ((0, 0),)]  # 0 — мёртвое состояние, 1 — начальное
+        self.index = {state: state_id for state_id, state in enumerate(self.states)}
+        self.transitions = [[None] * self.row_size for _ in self.states]
+
+    @classmethod
+    def for_distance(cls, max_distance):
+        table = cls._tables.get(max_distance)
+        if table is None:
+            table = cls._tables[max_distance] = cls(max_distance)
+        return table
+
+    def vector(self, masks, char, offset, word_len):
+        """
+        Кодирует символ как (1 << r) | биты совпадений, где r — сколько
+        символов слова осталось в окне.
+        """
+        rest = min(word_len - offset, self.window)
+        return (1 << rest) | ((masks.get(char, 0) >> offset) & ((1 << rest) - 1))
+
+    def transition(self, state_id, vector):
+        """
+        Возвращает (следующее состояние, сдвиг базовой позиции).
+        """
+        entry = self.transitions[state_id][vector]
+        if entry is None:
+            entry = self.transitions[state_id][vector] = self._compute(state_id, vector)
+        return entry
+
+    def _compute(self, state_id, vector):
+        rest = vector.bit_length() - 1
+        positions = set()
+        for d, e in self.states[state_id]:
+            if d < rest and vector >> d & 1:
+                # Совпадение символа
+                positions.add((d + 1, e))
+                continue
+            if e < self.max_distance:
+                # Добавление символа
+                positions.add((d, e + 1))
+                if d < rest:
+                    # Замена символа
+                    positions.add((d + 1, e + 1))
+                # Удаление символов слова перед совпадением
+                for skip in range(1, self.max_distance - e + 1):
+                    if d + skip < rest and vector >> (d + skip) & 1:
+                        positions.add((d + skip + 1, e + skip))
+                        break
+
+        # Убираем позиции, поглощённые позициями с меньшим числом ошибок
+        positions = [
+            (d, e) for d, e in positions
+            if not any(f < e and abs(d - c) <= e - f for c, f in positions)
+        ]
+        if not positions:
+            return 0, 0
+
+        shift = min(d for d, _ in positions)
+        state = tuple(sorted((d - shift, e) for d, e in positions))
+        next_id = self.index.get(state)
+        if next_id is None:
+            next_id = self.index[state] = len(self.states)
+            self.states.append(state)
+            self.transitions.append([None] * self.row_size)
+        return next_id, shift
+
+
 class LevenshteinAutomaton:
-    def __init__(self, word, max_distance):
+    def __init__(self, word, max_distance, compiled=None):
         """
         word: Слово из словаря, с которым будем сравнивать.
         max_distance: Максимально допустимое расстояние Левенштейна.
+        compiled: Использовать детерминированную таблицу ParametricTable
+            вместо множеств состояний НКА. По умолчанию включается
+            для max_distance <= MAX_COMPILED_DISTANCE.
         """
         self.word = word
         self.max_distance = max_distance
+        if compiled is None:
+            compiled = max_distance <= MAX_COMPILED_DISTANCE
+        self.compiled = compiled
+
+        if compiled:
+            self.table = ParametricTable.for_distance(max_distance)
+            self.masks = {}
+            for i, char in enumerate(word):
+                self.masks[char] = self.masks.get(char, 0) | (1 << i)
 
     def build_automaton(self):
         """
@@ -44,36 +174,472 @@ class LevenshteinAutomaton:
 
         self.states = states
 
+    def start(self):
+        """
+        Возвращает начальное состояние: (номер состояния, смещение)
+        в компилированном режиме или множество состояний НКА.
+        """
+        if self.compiled:
+            return 1, 0
+        return self._nfa_start()
+
+    def step(self, states, char):
+        """
+        Переводит состояние по символу char.
+        Ложное значение означает, что совпадение уже невозможно.
+        """
+        if not self.compiled:
+            return self._nfa_step(states, char)
+
+        state_id, offset = states
+        vector = self.table.vector(self.masks, char, offset, len(self.word))
+        next_id, shift = self.table.transition(state_id, vector)
+        if next_id == 0:
+            return None
+        return next_id, offset + shift
+
+    def distance(self, states):
+        """
+        Возвращает расстояние Левенштейна до self.word для прочитанного входа
+        или None, если оно больше max_distance.
+        """
+        word_len = len(self.word)
+        if self.compiled:
+            state_id, offset = states
+            positions = self.table.states[state_id]
+        else:
+            offset = 0
+            positions = states
+
+        best = None
+        for d, e in positions:
+            # Оставшиеся символы слова удаляются
+            total = e + word_len - offset - d
+            if total <= self.max_distance and (best is None or total < best):
+                best = total
+        return best
+
+    def is_match(self, states):
+        """
+        Проверяет, является ли состояние допускающим.
+        """
+        return self.distance(states) is not None
+
     def match(self, input_word):
         """
         Проверяет, возможно ли преобразовать input_word в self.word
         за max_distance операций.
         """
-        current_states = {(0, 0)}
+        current_states = self.start()
 
         for char in input_word:
-            next_states = set()
-            for state in current_states:
-                i, j = state
+            current_states = self.step(current_states, char)
+            if not current_states:
+                return False
 
-                if j < self.max_distance:
-                    # Добавление символа
-                    next_states.add((i, j + 1))
+        # Проверка, что конечное состояние допустимо
+        return self.is_match(current_states)
 
-                if i < len(self.word):
-                    # Удаление символа
+    def _nfa_start(self):
+        """
+        Возвращает начальное множество состояний НКА.
+        """
+        return self._close({(0, 0)})
+
+    def _close(self, states):
+        """
+        Добавляет состояния, достижимые удалением символов self.word
+        (переходы без чтения входного символа).
+        """
+        word_len = len(self.word)
+        stack = list(states)
+        closed = set(states)
+        while stack:
+            i, j = stack.pop()
+            if i < word_len and j < self.max_distance and (i + 1, j + 1) not in closed:
+                closed.add((i + 1, j + 1))
+                stack.append((i + 1, j + 1))
+        return closed
+
+    def _nfa_step(self, states, char):
+        """
+        Переводит множество состояний НКА по символу char.
+        """
+        word_len = len(self.word)
+        next_states = set()
+        for i, j in states:
+            if i < word_len and self.word[i] == char:
+                # Совпадение символа
+                next_states.add((i + 1, j))
+            if j < self.max_distance:
+                # Добавление символа
+                next_states.add((i, j + 1))
+                if i < word_len:
+                    # Замена символа
                     next_states.add((i + 1, j + 1))
+        return self._close(next_states)
 
-                    # Совпадение или замена символа
-                    if self.word[i] == char:
-                        next_states.add((i + 1, j))
-                    else:
-                        next_states.add((i + 1, j + 1))
 
-            current_states = next_states
+class TrieNode:
+    __slots__ = ("children", "is_word")
+
+    def __init__(self):
+        self.children = {}
+        self.is_word = False
+
+
+class Trie:
+    """
+    Префиксное дерево словаря. Общие префиксы слов хранятся один раз,
+    поэтому автомат Левенштейна проходит их тоже один раз.
+    """
+
+    def __init__(self):
+        self.root = TrieNode()
+        self.size = 0
+
+    @classmethod
+    def from_words(cls, words):
+        trie = cls()
+        for word in words:
+            trie.add(word)
+        return trie
+
+    def add(self, word):
+        """
+        Добавляет слово в дерево. Возвращает False, если слово уже было.
+        """
+        node = self.root
+        for char in word:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = TrieNode()
+            node = child
+        if node.is_word:
+            return False
+        node.is_word = True
+        self.size += 1
+        return True
+
+    def __contains__(self, word):
+        node = self.root
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                return False
+        return node.is_word
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def version(self):
+        # Слова только добавляются, поэтому размер однозначно задаёт версию
+        return self.size
+
+    def __iter__(self):
+        """
+        Перебирает слова в алфавитном порядке.
+        """
+        stack = [(self.root, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if node.is_word:
+                yield prefix
+            for char, child in sorted(node.children.items(), reverse=True):
+                stack.append((child, prefix + char))
+
+
+def search_index(root, automaton):
+    """
+    Обходит префиксное дерево синхронно с автоматом Левенштейна
+    и выдаёт подходящие слова в алфавитном порядке.
+    Поддерево отбрасывается целиком, как только множество состояний пустеет.
+    """
+    stack = [(root, "", automaton.start())]
+    while stack:
+        node, prefix, states = stack.pop()
+        if node.is_word and automaton.is_match(states):
+            yield prefix
+        for char, child in sorted(node.children.items(), reverse=True):
+            next_states = automaton.step(states, char)
+            if next_states:
+                stack.append((child, prefix + char, next_states))
+
+
+class _RangeNode:
+    """
+    Неявный узел префиксного дерева над отсортированным BinaryDictionary:
+    слова с номерами [lo, hi) имеют общий префикс длины depth.
+    """
+    __slots__ = ("dictionary", "lo", "hi", "depth", "is_word")
+
+    def __init__(self, dictionary, lo, hi, depth):
+        self.dictionary = dictionary
+        self.lo = lo
+        self.hi = hi
+        self.depth = depth
+        # Сам префикс, если он есть в словаре, идёт первым
+        self.is_word = lo < hi and len(dictionary.base_word(lo)) == depth
+
+    @property
+    def children(self):
+        children = {}
+        depth = self.depth
+        i = self.lo + 1 if self.is_word else self.lo
+        while i < self.hi:
+            word = self.dictionary.base_word(i)
+            char = word[depth]
+            upper = (word[:depth] + chr(ord(char) + 1)).encode("utf-8", "surrogatepass")
+            j = self.dictionary.bisect(upper, i, self.hi)
+            children[char] = _RangeNode(self.dictionary, i, j, depth + 1)
+            i = j
+        return children
+
+
+class _UnionNode:
+    """
+    Объединение узлов нескольких деревьев (основной файл и журнал добавлений).
+    """
+    __slots__ = ("nodes", "is_word")
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.is_word = any(node.is_word for node in nodes)
+
+    @property
+    def children(self):
+        grouped = {}
+        for node in self.nodes:
+            for char, child in node.children.items():
+                grouped.setdefault(char, []).append(child)
+        return {
+            char: nodes[0] if len(nodes) == 1 else _UnionNode(nodes)
+            for char, nodes in sorted(grouped.items())
+        }
+
+
+class BinaryDictionary:
+    """
+    Отсортированный словарь в бинарном формате, открываемый через mmap.
+
+    Формат файла: заголовок BINARY_HEADER, таблица смещений (count + 1 чисел
+    uint32) и слова в UTF-8 подряд. Порядок байтов UTF-8 совпадает с порядком
+    строк Python, поэтому бинарный поиск идёт по байтам без создания str.
+    Новые слова дописываются в журнал <path>.delta и вливаются в основной
+    файл, когда их становится больше DELTA_MERGE_THRESHOLD.
+    source_path: Текстовый словарь (windows-1251), из которого собран файл;
+        при слиянии журнала он переписывается вместе с бинарным.
+    """
+
+    def __init__(self, path, source_path=None):
+        self.path = path
+        self.source_path = source_path
+        self.delta_path = path + ".delta"
+        self._open()
+
+        self.delta = Trie()
+        if os.path.exists(self.delta_path):
+            with open(self.delta_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    word = line.rstrip("\n")
+                    if word and not self._base_contains(word):
+                        self.delta.add(word)
+
+    def _open(self):
+        with open(self.path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = BINARY_HEADER.unpack_from(self._mmap, 0)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Файл {self.path} не является бинарным словарём.")
+        self.count = count
+        self.mtime_ns = os.stat(self.path).st_mtime_ns
+        offsets_end = BINARY_HEADER.size + 4 * (count + 1)
+        self._offsets = memoryview(self._mmap)[BINARY_HEADER.size:offsets_end].cast("I")
+        self._data_start = offsets_end
+
+    def close(self):
+        self._offsets.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def build(path, words):
+        """
+        Записывает бинарный словарь из отсортированной последовательности слов.
+        Повторы пропускаются, нарушение порядка вызывает ValueError.
+        """
+        offsets = array("I", [0])
+        data_path = path + ".tmp"
+        previous = None
+        with open(data_path, "wb") as data:
+            for word in words:
+                encoded = word.encode("utf-8")
+                if previous is not None and encoded <= previous:
+                    if encoded == previous:
+                        continue
+                    raise ValueError(f"Слова не отсортированы: '{word}'.")
+                data.write(encoded)
+                offsets.append(offsets[-1] + len(encoded))
+                previous = encoded
+
+        with open(path, "wb") as file, open(data_path, "rb") as data:
+            file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(offsets) - 1))
+            offsets.tofile(file)
+            while True:
+                block = data.read(1 << 20)
+                if not block:
+                    break
+                file.write(block)
+        os.remove(data_path)
+
+    def _key(self, index):
+        start = self._data_start + self._offsets[index]
+        end = self._data_start + self._offsets[index + 1]
+        return self._mmap[start:end]
+
+    def base_word(self, index):
+        return self._key(index).decode("utf-8")
+
+    def bisect(self, key, lo=0, hi=None):
+        """
+        Бинарный поиск по байтам: первая позиция, где слово не меньше key.
+        """
+        if hi is None:
+            hi = self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _base_contains(self, word):
+        key = word.encode("utf-8")
+        index = self.bisect(key)
+        return index < self.count and self._key(index) == key
+
+    def __contains__(self, word):
+        return word in self.delta or self._base_contains(word)
+
+    def __len__(self):
+        return self.count + len(self.delta)
+
+    def __iter__(self):
+        base = (self.base_word(i) for i in range(self.count))
+        return heapq.merge(base, iter(self.delta))
+
+    @property
+    def version(self):
+        """
+        Меняется при пересборке основного файла и при каждом добавлении слова.
+        """
+        return self.mtime_ns, len(self.delta)
+
+    @property
+    def root(self):
+        base_root = _RangeNode(self, 0, self.count, 0)
+        if not self.delta:
+            return base_root
+        return _UnionNode([base_root, self.delta.root])
+
+    def add(self, word):
+        """
+        Дописывает слово в журнал. Возвращает False, если слово уже есть.
+        """
+        if word in self:
+            return False
+        with open(self.delta_path, "a", encoding="utf-8") as file:
+            file.write(word + "\n")
+        self.delta.add(word)
+        if len(self.delta) > DELTA_MERGE_THRESHOLD:
+            self.compact()
+        return True
+
+    def compact(self):
+        """
+        Вливает журнал добавлений в основной файл.
+        """
+        merged_path = self.path + ".merged"
+        if self.source_path is None:
+            BinaryDictionary.build(merged_path, iter(self))
+        else:
+            # Иначе open_dictionary, пересобирая .bin из более нового текстового файла,
+            # потерял бы слова, которые были только в журнале
+            source_merged_path = self.source_path + ".merged"
+            with open(source_merged_path, "w", encoding="windows-1251") as file:
+                for word in self:
+                    file.write(word + "\n")
+            with open(source_merged_path, "r", encoding="windows-1251") as file:
+                BinaryDictionary.build(merged_path, (line.rstrip("\n") for line in file))
+            os.replace(source_merged_path, self.source_path)
+        self.close()
+        os.replace(merged_path, self.path)
+        if os.path.exists(self.delta_path):
+            os.remove(self.delta_path)
+        self.delta = Trie()
+        self._open()
+
+
+class SuggestionCache:
+    """
+    LRU-кэш результатов проверки: ключ (слово, max_distance, версия словаря),
+    значение None для верного слова или список предложений.
+    Может сохраняться в JSON-файл между запусками.
+    """
+
+    def __init__(self, capacity=SUGGESTION_CACHE_SIZE, path=None):
+        self.capacity = capacity
+        self.path = path
+        self.entries = OrderedDict()
+
+    def get(self, key, default=None):
+        if key not in self.entries:
+            return default
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def invalidate(self):
+        self.entries.clear()
+
+    def load(self, path=None):
+        self.path = path or self.path
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                records = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return
+        for word, max_distance, version, value in records:
+            if isinstance(version, list):
+                version = tuple(version)
+            self.put((word, max_distance, version), value)
+
+    def save(self, path=None):
+        self.path = path or self.path
+        records = [[word, max_distance, version, value]
+                   for (word, max_distance, version), value in self.entries.items()]
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(records, file, ensure_ascii=False)
+
+
+suggestion_cache = SuggestionCache()
 
-        # Проверка, что конечное состояние допустимо
-        return any(state[0] == len(self.word) and state[1] <= self.max_distance for state in current_states)
+
+def dictionary_version(dictionary):
+    return getattr(dictionary, "version", len(dictionary))
 
 
 def load_dictionary(filepath):
@@ -96,54 +662,128 @@ def save_to_dictionary(filepath, dictionary):
         file.write("\n".join(dictionary))
 
 
-def add_word_to_sorted_dictionary(word, filepath):
+def add_word_to_sorted_dictionary(word, filepath, dictionary=None):
     """
     Добавляет слово в отсортированный словарь и сохраняет изменения.
+    Если передан открытый BinaryDictionary, слово дописывается в его журнал,
+    а текстовый файл не перезаписывается.
     """
-    dictionary = load_dictionary(filepath)
-    if word not in dictionary:
-        from bisect import insort
-        insort(dictionary, word)  # Вставляем слово в отсортированный список
-        save_to_dictionary(filepath, dictionary)
+    if isinstance(dictionary, BinaryDictionary):
+        added = dictionary.add(word)
+    else:
+        words = load_dictionary(filepath)
+        added = word not in words
+        if added:
+            from bisect import insort
+            insort(words, word)  # Вставляем слово в отсортированный список
+            save_to_dictionary(filepath, words)
+            if isinstance(dictionary, Trie):
+                dictionary.add(word)
+
+    if added:
+        suggestion_cache.invalidate()
         print(f"Слово '{word}' добавлено в словарь.")
     else:
         print(f"Слово '{word}' уже есть в словаре.")
 
 
-def suggest_word(input_word, dictionary, max_distance):
+def convert_dictionary(filepath, binary_path):
     """
-    Предлагает варианты замены слова из словаря, используя оптимизированный поиск.
+    Строит бинарный словарь из текстового файла в кодировке windows-1251.
     """
-    suggestions = []
-    start_index = bisect_left(dictionary, input_word[:1])  # Начинаем сужение по первой букве
+    try:
+        with open(filepath, "r", encoding="windows-1251") as file:
+            BinaryDictionary.build(binary_path, (line.rstrip("\n") for line in file if line.strip()))
+    except ValueError:
+        # Файл отсортирован не в порядке строк Python — сортируем в памяти
+        BinaryDictionary.build(binary_path, sorted(set(word for word in load_dictionary(filepath) if word)))
 
-    for word in dictionary[start_index:]:
-        if not word.startswith(input_word[:1]):
-            break  # Прекращаем, если слова уже не совпадают по первой букве
 
-        lev_automaton = LevenshteinAutomaton(word, max_distance)
-        lev_automaton.build_automaton()
-        if lev_automaton.match(input_word):
-            suggestions.append(word)
+def open_dictionary(filepath):
+    """
+    Открывает бинарную копию словаря (<filepath без расширения>.bin),
+    пересобирая её, если текстовый файл новее.
+    """
+    binary_path = os.path.splitext(filepath)[0] + ".bin"
+    if os.path.exists(filepath) and (
+        not os.path.exists(binary_path) or os.path.getmtime(filepath) > os.path.getmtime(binary_path)
+    ):
+        convert_dictionary(filepath, binary_path)
+    elif not os.path.exists(binary_path):
+        print("Файл словаря не найден. Создайте файл sorted_words.txt.")
+        BinaryDictionary.build(binary_path, [])
+    return BinaryDictionary(binary_path, filepath)
 
-        if len(suggestions) >= 5:  # Ограничиваем количество предложений
+
+def _trie_for_list(words):
+    """
+    Дерево для словаря-списка. Хранится одно, для последнего переданного списка:
+    пересборка на каждый поиск по словарю в миллион слов дороже самого поиска.
+    """
+    global _list_trie
+    if _list_trie is None or _list_trie[0] is not words or _list_trie[1] != len(words):
+        _list_trie = (words, len(words), Trie.from_words(words))
+    return _list_trie[2]
+
+
+def suggest_word(input_word, dictionary, max_distance, limit=5, frequencies=None):
+    """
+    Предлагает до limit вариантов замены слова из словаря,
+    упорядоченных по расстоянию Левенштейна, затем по частоте, затем по алфавиту.
+    dictionary: Trie, BinaryDictionary или список слов (дерево по нему строится
+        при первом вызове и переиспользуется, пока список не изменит длину).
+    frequencies: Необязательный словарь {слово: частота}.
+
+    Поиск идёт с углублением: сначала расстояние 0, затем 1, 2, ...
+    и останавливается, как только найдено limit слов — более близких уже быть не может.
+    """
+    if not isinstance(dictionary, (Trie, BinaryDictionary)):
+        dictionary = _trie_for_list(dictionary)
+
+    found = set()
+    suggestions = []
+    for distance in range(max_distance + 1):
+        lev_automaton = LevenshteinAutomaton(input_word, distance)
+        tier = [word for word in search_index(dictionary.root, lev_automaton) if word not in found]
+        if frequencies is not None:
+            tier.sort(key=lambda word: -frequencies.get(word, 0))
+        found.update(tier)
+        suggestions.extend(tier)
+        if len(suggestions) >= limit:
             break
 
-    return suggestions
+    return suggestions[:limit]
+
+
+def cached_suggestions(input_word, dictionary, max_distance):
+    """
+    Возвращает None, если слово верное, иначе список предложений.
+    Результат берётся из suggestion_cache, если словарь с тех пор не менялся.
+    """
+    key = (input_word, max_distance, dictionary_version(dictionary))
+    result = suggestion_cache.get(key, False)
+    if result is False:
+        if input_word in spell:
+            result = None
+        else:
+            result = suggest_word(input_word, dictionary, max_distance, frequencies=spell.word_frequency.dictionary)
+        suggestion_cache.put(key, result)
+    return result
 
 
 def check_spelling_and_suggest(input_word, dictionary, filepath, max_distance):
     """
     Проверяет слово на грамотность и предлагает варианты замены, если оно некорректно.
     """
+    suggestions = cached_suggestions(input_word, dictionary, max_distance)
+
     # Проверяем на грамотность
-    if input_word in spell:  # Слово грамматически верное
+    if suggestions is None:  # Слово грамматически верное
         print(f"Слово '{input_word}' написано корректно.")
         return
 
     # Если слово некорректное, предлагаются варианты через Левенштейна
     print(f"Слово '{input_word}' возможно написано с ошибкой.")
-    suggestions = suggest_word(input_word, dictionary, max_distance)
 
     if suggestions:
         print("Возможно, вы имели в виду:")
@@ -166,12 +806,101 @@ def check_spelling_and_suggest(input_word, dictionary, filepath, max_distance):
         print("Совпадений не найдено.")
         add_to_dict = input("Добавить слово в словарь? (да/нет): ").strip().lower()
         if add_to_dict == "да":
-            add_word_to_sorted_dictionary(input_word, filepath)
+            add_word_to_sorted_dictionary(input_word, filepath, dictionary)
+
+
+def read_tokens(source, encoding="windows-1251"):
+    """
+    Читает текст из файла (путь) или из потока построчно
+    и возвращает уникальные слова в порядке первого появления.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", encoding=encoding) as file:
+            return read_tokens(file)
+
+    tokens = {}
+    for line in source:
+        for token in WORD_PATTERN.findall(line.lower()):
+            tokens.setdefault(token)
+    return list(tokens)
+
+
+_worker_dictionary = None
 
 
-def main():
+def _init_worker(filepath):
+    """
+    Загружает словарь один раз на процесс, чтобы не передавать его с каждой задачей.
+    """
+    global _worker_dictionary
+    _worker_dictionary = open_dictionary(filepath)
+
+
+def _suggest_chunk(tokens, max_distance):
+    frequencies = spell.word_frequency.dictionary
+    return [(token, suggest_word(token, _worker_dictionary, max_distance, frequencies=frequencies))
+            for token in tokens]
+
+
+def check_text(source, filepath, max_distance=1, workers=None, encoding="windows-1251"):
+    """
+    Пакетная проверка текста без диалога с пользователем.
+
+    source: Путь к файлу или поток с текстом.
+    filepath: Путь к файлу словаря.
+    workers: Число процессов (по умолчанию — число ядер).
+    Возвращает словарь {слово с ошибкой: список предложений}
+    для каждого уникального слова, которого нет ни в SpellChecker, ни в словаре.
+    Уже проверенные слова берутся из suggestion_cache.
+    """
+    tokens = read_tokens(source, encoding)
+    results = {}
+    with open_dictionary(filepath) as dictionary:
+        version = dictionary_version(dictionary)
+
+        # Слова, уже проверенные раньше, берутся из кэша
+        pending = []
+        for token in tokens:
+            cached = suggestion_cache.get((token, max_distance, version), False)
+            if cached is False:
+                pending.append(token)
+            elif cached is not None:
+                results[token] = cached
+
+        unknown = {token for token in spell.unknown(pending) if token not in dictionary}
+        for token in pending:
+            if token not in unknown:
+                suggestion_cache.put((token, max_distance, version), None)
+        unknown = sorted(unknown)
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(unknown) < PARALLEL_THRESHOLD:
+            frequencies = spell.word_frequency.dictionary
+            computed = [(token, suggest_word(token, dictionary, max_distance, frequencies=frequencies))
+                        for token in unknown]
+        else:
+            chunk_size = -(-len(unknown) // (workers * 4))
+            chunks = [unknown[i:i + chunk_size] for i in range(0, len(unknown), chunk_size)]
+            computed = []
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(filepath,)) as pool:
+                for chunk_result in pool.map(_suggest_chunk, chunks, [max_distance] * len(chunks)):
+                    computed.extend(chunk_result)
+
+    for token, suggestions in computed:
+        suggestion_cache.put((token, max_distance, version), suggestions)
+        results[token] = suggestions
+    return dict(sorted(results.items()))
+
+
+def main(cache_path=None):
+    """
+    Интерактивная проверка.
+    cache_path: Файл для сохранения кэша между запусками; по умолчанию кэш не сохраняется.
+    """
     filepath = "sorted_words.txt"
-    dictionary = load_dictionary(filepath)
+    dictionary = open_dictionary(filepath)
+    if cache_path:
+        suggestion_cache.load(cache_path)
 
     if not dictionary:
         print("Словарь пуст или отсутствует. Начните добавлять слова.")
@@ -182,6 +911,32 @@ def main():
     for word in input_string.split():
         check_spelling_and_suggest(word, dictionary, filepath, max_distance)
 
+    if cache_path:
+        suggestion_cache.save()
+
+
+def batch_main(argv):
+    parser = argparse.ArgumentParser(description="Пакетная проверка орфографии текста.")
+    parser.add_argument("source", help="файл с текстом или '-' для стандартного ввода")
+    parser.add_argument("--dictionary", default="sorted_words.txt", help="файл словаря")
+    parser.add_argument("--distance", type=int, default=1, help="максимальное расстояние Левенштейна")
+    parser.add_argument("--workers", type=int, default=None, help="число процессов")
+    parser.add_argument("--cache", default=None, help="файл для сохранения кэша между запусками")
+    args = parser.parse_args(argv)
+
+    if args.cache:
+        suggestion_cache.load(args.cache)
+    source = sys.stdin if args.source == "-" else args.source
+    results = check_text(source, args.dictionary, args.distance, args.workers)
+    if args.cache:
+        suggestion_cache.save()
+    for token, suggestions in results.items():
+        print(f"{token}: {', '.join(suggestions)}")
+
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        batch_main(sys.argv[1:])
+    else:
+        # Как --cache в пакетном режиме: файл кэша задаётся явно
+        main(os.environ.get("FSMLEV_CACHE"))
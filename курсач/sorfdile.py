@@ -1,11 +1,154 @@
-def sort_file_alphabetically(input_filepath, output_filepath):
+import heapq
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+# Объём памяти под строки по умолчанию (в байтах)
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+
+# Сколько отсортированных частей сливается за один проход
+MAX_MERGE_FANIN = 128
+
+# Примерные накладные расходы Python на одну строку в списке
+LINE_OVERHEAD = 80
+
+
+def _unique(lines):
+    """
+    Убирает подряд идущие повторы из отсортированной последовательности.
+    """
+    previous = None
+    for line in lines:
+        if line != previous:
+            yield line
+            previous = line
+
+
+def _read_chunks(file, chunk_limit):
+    """
+    Читает файл кусками, каждый из которых занимает в памяти примерно chunk_limit байт.
+    """
+    chunk = []
+    size = 0
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+        chunk.append(line)
+        size += len(line) * 2 + LINE_OVERHEAD
+        if size >= chunk_limit:
+            yield chunk
+            chunk = []
+            size = 0
+    if chunk:
+        yield chunk
+
+
+def _write_run(lines, run_path, unique):
+    """
+    Сортирует кусок и сохраняет его во временный файл.
+    """
+    lines.sort()
+    if unique:
+        lines = _unique(lines)
+    with open(run_path, 'w', encoding='windows-1251', newline='\n') as file:
+        for line in lines:
+            file.write(line + '\n')
+    return run_path
+
+
+def _read_run(run_path):
+    with open(run_path, 'r', encoding='windows-1251', newline='\n') as file:
+        for line in file:
+            yield line[:-1]
+
+
+def _merge_runs(run_paths, output_file, unique, last):
+    """
+    k-путевое слияние отсортированных частей через кучу (heapq.merge).
+    Итоговый файл пишется без завершающего перевода строки, как раньше.
+    """
+    lines = heapq.merge(*(_read_run(path) for path in run_paths))
+    if unique:
+        lines = _unique(lines)
+    if last:
+        for i, line in enumerate(lines):
+            output_file.write(line if i == 0 else '\n' + line)
+    else:
+        for line in lines:
+            output_file.write(line + '\n')
+
+
+def external_sort(input_filepath, output_filepath, memory_limit=DEFAULT_MEMORY_LIMIT, unique=True, workers=1):
+    """
+    Внешняя сортировка: файл читается кусками, отсортированные куски
+    сбрасываются во временные файлы, затем сливаются.
+
+    memory_limit: Примерный объём памяти под строки (на все процессы).
+    unique: Удалять повторяющиеся строки.
+    workers: Число процессов для сортировки кусков.
+    """
+    temp_dir = tempfile.mkdtemp(prefix='sort_', dir=os.path.dirname(os.path.abspath(output_filepath)))
+    try:
+        chunk_limit = max(memory_limit // max(workers, 1), 1)
+        run_paths = []
+
+        with open(input_filepath, 'r', encoding='windows-1251') as file:
+            chunks = _read_chunks(file, chunk_limit)
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    pending = []
+                    for chunk in chunks:
+                        run_path = os.path.join(temp_dir, f'run{len(run_paths) + len(pending)}.txt')
+                        pending.append(pool.submit(_write_run, chunk, run_path, unique))
+                        # Не держим в памяти больше кусков, чем процессов
+                        if len(pending) >= workers:
+                            run_paths.append(pending.pop(0).result())
+                    run_paths.extend(future.result() for future in pending)
+            else:
+                for chunk in chunks:
+                    run_path = os.path.join(temp_dir, f'run{len(run_paths)}.txt')
+                    run_paths.append(_write_run(chunk, run_path, unique))
+
+        # Если частей слишком много, сливаем их в несколько проходов
+        generation = 0
+        while len(run_paths) > MAX_MERGE_FANIN:
+            merged_paths = []
+            for start in range(0, len(run_paths), MAX_MERGE_FANIN):
+                merged_path = os.path.join(temp_dir, f'merge{generation}_{start}.txt')
+                with open(merged_path, 'w', encoding='windows-1251', newline='\n') as merged:
+                    _merge_runs(run_paths[start:start + MAX_MERGE_FANIN], merged, unique, last=False)
+                for path in run_paths[start:start + MAX_MERGE_FANIN]:
+                    os.remove(path)
+                merged_paths.append(merged_path)
+            run_paths = merged_paths
+            generation += 1
+
+        with open(output_filepath, 'w', encoding='windows-1251') as file:
+            _merge_runs(run_paths, file, unique, last=True)
+    finally:
+        for name in os.listdir(temp_dir):
+            os.remove(os.path.join(temp_dir, name))
+        os.rmdir(temp_dir)
+
+
+def sort_file_alphabetically(input_filepath, output_filepath, memory_limit=DEFAULT_MEMORY_LIMIT, unique=True,
+                             workers=1):
     """
     Сортирует содержимое файла по алфавиту и сохраняет в новый файл.
 
     input_filepath: Путь к исходному файлу.
     output_filepath: Путь к файлу, куда будет записан результат.
+    memory_limit: Если файл больше этого объёма, используется внешняя сортировка.
+    unique: Удалять повторяющиеся строки.
+    workers: Число процессов для внешней сортировки.
     """
     try:
+        if os.path.getsize(input_filepath) * 2 > memory_limit:
+            external_sort(input_filepath, output_filepath, memory_limit, unique, workers)
+            print(f"Файл успешно отсортирован и сохранён в: {output_filepath}")
+            return
+
         # Чтение строк из файла
         with open(input_filepath, 'r', encoding='windows-1251') as file:
             lines = file.readlines()
@@ -15,6 +158,8 @@ def sort_file_alphabetically(input_filepath, output_filepath):
 
         # Сортировка строк
         lines.sort()
+        if unique:
+            lines = list(_unique(lines))
 
         # Запись отсортированных строк в новый файл
         with open(output_filepath, 'w', encoding='windows-1251') as file:
@@ -27,7 +172,9 @@ def sort_file_alphabetically(input_filepath, output_filepath):
     except Exception as e:
         print(f"Произошла ошибка: {e}")
 
-# Пример использования
-input_file = 'russian.txt'  # Исходный файл
-output_file = 'sorted_words.txt'  # Файл для сохранения результата
-sort_file_alphabetically(input_file, output_file)
+
+if __name__ == "__main__":
+    # Пример использования
+    input_file = 'russian.txt'  # Исходный файл
+    output_file = 'sorted_words.txt'  # Файл для сохранения результата
+    sort_file_alphabetically(input_file, output_file)